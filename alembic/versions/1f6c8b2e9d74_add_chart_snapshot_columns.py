@@ -0,0 +1,31 @@
+"""Add chart snapshot rank and share_count
+
+Revision ID: 1f6c8b2e9d74
+Revises: e92b4d7f6a03
+Create Date: 2026-10-17 21:20:44.803126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f6c8b2e9d74'
+down_revision: Union[str, None] = 'e92b4d7f6a03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # chart_songs는 지금까지 쓰인 적이 없으므로 기본값 없이 NOT NULL로 추가
+    op.add_column('chart_songs', sa.Column('rank', sa.Integer(), nullable=False))
+    op.add_column('chart_songs', sa.Column('share_count', sa.Integer(), nullable=False))
+    op.create_index('ix_charts_chartType_generatedAt', 'charts', ['chartType', 'generatedAt'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_charts_chartType_generatedAt', table_name='charts')
+    op.drop_column('chart_songs', 'share_count')
+    op.drop_column('chart_songs', 'rank')
@@ -0,0 +1,26 @@
+"""Add feed keyset index
+
+Revision ID: 5b1e7c9a2d41
+Revises: 44850d1382e9
+Create Date: 2026-10-17 19:02:11.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c9a2d41'
+down_revision: Union[str, None] = '44850d1382e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_songs_sharedBy_sharedAt_songId', 'songs', ['sharedBy', 'sharedAt', 'songId'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_songs_sharedBy_sharedAt_songId', table_name='songs')
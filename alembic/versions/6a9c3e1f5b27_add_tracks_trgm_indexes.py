@@ -0,0 +1,31 @@
+"""Add trigram indexes for local track search
+
+Revision ID: 6a9c3e1f5b27
+Revises: d4f8a2b6c913
+Create Date: 2026-10-18 01:12:44.318260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a9c3e1f5b27'
+down_revision: Union[str, None] = 'd4f8a2b6c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_tracks_title_trgm', 'tracks', ['title'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_tracks_artist_trgm', 'tracks', ['artist'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'artist': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tracks_artist_trgm', table_name='tracks')
+    op.drop_index('ix_tracks_title_trgm', table_name='tracks')
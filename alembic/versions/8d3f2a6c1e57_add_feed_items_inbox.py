@@ -0,0 +1,39 @@
+"""Add feed_items inbox
+
+Revision ID: 8d3f2a6c1e57
+Revises: 5b1e7c9a2d41
+Create Date: 2026-10-17 19:41:37.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f2a6c1e57'
+down_revision: Union[str, None] = '5b1e7c9a2d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('feed_items',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('song_id', sa.Integer(), nullable=False),
+    sa.Column('sharedBy', sa.Integer(), nullable=False),
+    sa.Column('sharedAt', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.userId'], ),
+    sa.ForeignKeyConstraint(['song_id'], ['songs.songId'], ),
+    sa.ForeignKeyConstraint(['sharedBy'], ['users.userId'], ),
+    sa.PrimaryKeyConstraint('user_id', 'song_id')
+    )
+    op.create_index('ix_feed_items_user_id_sharedAt_song_id', 'feed_items', ['user_id', 'sharedAt', 'song_id'], unique=False)
+    op.create_index('ix_feed_items_user_id_sharedBy', 'feed_items', ['user_id', 'sharedBy'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_feed_items_user_id_sharedBy', table_name='feed_items')
+    op.drop_index('ix_feed_items_user_id_sharedAt_song_id', table_name='feed_items')
+    op.drop_table('feed_items')
@@ -0,0 +1,27 @@
+"""Drop users lower(name) prefix index
+
+Revision ID: 9c4e7b2a5d86
+Revises: f2b7d9a4c168
+Create Date: 2026-10-18 11:42:09.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e7b2a5d86'
+down_revision: Union[str, None] = 'f2b7d9a4c168'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 짧은 검색어도 부분 일치로 검색하게 되어 앞부분 일치용 인덱스는 더 이상 쓰이지 않음
+    op.drop_index('ix_users_name_lower_prefix', table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index('ix_users_name_lower_prefix', 'users', [sa.text('lower(name) text_pattern_ops')], unique=False)
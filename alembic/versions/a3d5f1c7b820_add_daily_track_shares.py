@@ -0,0 +1,43 @@
+"""Add daily_track_shares rollup
+
+Revision ID: a3d5f1c7b820
+Revises: 1f6c8b2e9d74
+Create Date: 2026-10-17 21:58:19.334270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d5f1c7b820'
+down_revision: Union[str, None] = '1f6c8b2e9d74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('daily_track_shares',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('uri', sa.String(), nullable=False),
+    sa.Column('song_id', sa.Integer(), nullable=False),
+    sa.Column('share_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['song_id'], ['songs.songId'], ),
+    sa.PrimaryKeyConstraint('day', 'uri')
+    )
+    # 기존 공유 기록으로 집계 채우기
+    op.execute(
+        """
+        INSERT INTO daily_track_shares (day, uri, song_id, share_count)
+        SELECT CAST("sharedAt" AS DATE), uri, MIN("songId"), COUNT(*)
+        FROM songs
+        WHERE uri IS NOT NULL AND "sharedAt" IS NOT NULL
+        GROUP BY CAST("sharedAt" AS DATE), uri
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('daily_track_shares')
@@ -0,0 +1,135 @@
+"""Normalize track metadata into tracks table
+
+Revision ID: b7e2c4a91f35
+Revises: a3d5f1c7b820
+Create Date: 2026-10-17 22:47:31.552019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c4a91f35'
+down_revision: Union[str, None] = 'a3d5f1c7b820'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def track_key_sql(table: str) -> str:
+    # 공유 행의 트랙 키: uri가 없으면 Spotify URL에서 만들고, 그것도 안 되면 공유 행 단위의 로컬 키
+    return f"""
+        COALESCE(
+            {table}.uri,
+            CASE WHEN {table}.spotify_url LIKE '%/track/%'
+                 THEN 'spotify:track:' || split_part(split_part({table}.spotify_url, '/track/', 2), '?', 1)
+            END,
+            'local:song:' || {table}."songId"
+        )
+    """
+
+
+TRACK_COLUMNS = ['title', 'artist', 'album', 'spotify_url', 'album_cover_url', 'uri']
+
+
+def upgrade() -> None:
+    op.create_table('tracks',
+    sa.Column('trackId', sa.Integer(), nullable=False),
+    sa.Column('uri', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('artist', sa.String(), nullable=False),
+    sa.Column('album', sa.String(), nullable=False),
+    sa.Column('spotify_url', sa.String(), nullable=False),
+    sa.Column('album_cover_url', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('trackId')
+    )
+    op.create_index(op.f('ix_tracks_trackId'), 'tracks', ['trackId'], unique=False)
+    op.create_index(op.f('ix_tracks_uri'), 'tracks', ['uri'], unique=True)
+
+    # 트랙별로 가장 최근에 공유된 행의 곡 정보를 사용
+    op.execute(f"""
+        INSERT INTO tracks (uri, title, artist, album, spotify_url, album_cover_url)
+        SELECT DISTINCT ON (track_key) track_key, title, artist, album, spotify_url, album_cover_url
+        FROM (SELECT *, {track_key_sql('songs')} AS track_key FROM songs) AS keyed
+        ORDER BY track_key, "songId" DESC
+    """)
+
+    op.add_column('songs', sa.Column('track_id', sa.Integer(), nullable=True))
+    op.execute(f"""
+        UPDATE songs SET track_id = tracks."trackId"
+        FROM tracks
+        WHERE tracks.uri = {track_key_sql('songs')}
+    """)
+    op.alter_column('songs', 'track_id', nullable=False)
+    op.create_foreign_key('songs_track_id_fkey', 'songs', 'tracks', ['track_id'], ['trackId'])
+    op.create_index(op.f('ix_songs_track_id'), 'songs', ['track_id'], unique=False)
+
+    # 일별 집계도 uri 대신 정수 키 track_id 기준으로 다시 만듦
+    op.drop_table('daily_track_shares')
+    op.create_table('daily_track_shares',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('track_id', sa.Integer(), nullable=False),
+    sa.Column('song_id', sa.Integer(), nullable=False),
+    sa.Column('share_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['track_id'], ['tracks.trackId'], ),
+    sa.ForeignKeyConstraint(['song_id'], ['songs.songId'], ),
+    sa.PrimaryKeyConstraint('day', 'track_id')
+    )
+    op.execute("""
+        INSERT INTO daily_track_shares (day, track_id, song_id, share_count)
+        SELECT CAST("sharedAt" AS DATE), track_id, MIN("songId"), COUNT(*)
+        FROM songs
+        WHERE "sharedAt" IS NOT NULL
+        GROUP BY CAST("sharedAt" AS DATE), track_id
+    """)
+
+    for column in TRACK_COLUMNS:
+        op.drop_column('songs', column)
+
+
+def downgrade() -> None:
+    op.add_column('songs', sa.Column('title', sa.String(), nullable=True))
+    op.add_column('songs', sa.Column('artist', sa.String(), nullable=True))
+    op.add_column('songs', sa.Column('album', sa.String(), nullable=True))
+    op.add_column('songs', sa.Column('spotify_url', sa.String(), nullable=True))
+    op.add_column('songs', sa.Column('album_cover_url', sa.String(), nullable=True))
+    op.add_column('songs', sa.Column('uri', sa.String(), nullable=True))
+    op.execute("""
+        UPDATE songs SET
+            title = tracks.title,
+            artist = tracks.artist,
+            album = tracks.album,
+            spotify_url = tracks.spotify_url,
+            album_cover_url = tracks.album_cover_url,
+            uri = CASE WHEN tracks.uri LIKE 'local:%' THEN NULL ELSE tracks.uri END
+        FROM tracks
+        WHERE tracks."trackId" = songs.track_id
+    """)
+    for column in ['title', 'artist', 'album', 'spotify_url']:
+        op.alter_column('songs', column, nullable=False)
+
+    op.drop_table('daily_track_shares')
+    op.create_table('daily_track_shares',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('uri', sa.String(), nullable=False),
+    sa.Column('song_id', sa.Integer(), nullable=False),
+    sa.Column('share_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['song_id'], ['songs.songId'], ),
+    sa.PrimaryKeyConstraint('day', 'uri')
+    )
+    op.execute("""
+        INSERT INTO daily_track_shares (day, uri, song_id, share_count)
+        SELECT CAST("sharedAt" AS DATE), uri, MIN("songId"), COUNT(*)
+        FROM songs
+        WHERE uri IS NOT NULL AND "sharedAt" IS NOT NULL
+        GROUP BY CAST("sharedAt" AS DATE), uri
+    """)
+
+    op.drop_index(op.f('ix_songs_track_id'), table_name='songs')
+    op.drop_constraint('songs_track_id_fkey', 'songs', type_='foreignkey')
+    op.drop_column('songs', 'track_id')
+    op.drop_index(op.f('ix_tracks_uri'), table_name='tracks')
+    op.drop_index(op.f('ix_tracks_trackId'), table_name='tracks')
+    op.drop_table('tracks')
@@ -0,0 +1,28 @@
+"""Add songs.reactedAt
+
+Revision ID: c47a9e0b3f18
+Revises: 8d3f2a6c1e57
+Create Date: 2026-10-17 20:13:52.660471
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47a9e0b3f18'
+down_revision: Union[str, None] = '8d3f2a6c1e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('songs', sa.Column('reactedAt', sa.DateTime(), nullable=True))
+    op.create_index('ix_songs_sharedBy_reactedAt', 'songs', ['sharedBy', 'reactedAt'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_songs_sharedBy_reactedAt', table_name='songs')
+    op.drop_column('songs', 'reactedAt')
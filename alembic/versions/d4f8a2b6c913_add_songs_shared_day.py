@@ -0,0 +1,38 @@
+"""Add songs.sharedDay with one share per user per day
+
+Revision ID: d4f8a2b6c913
+Revises: b7e2c4a91f35
+Create Date: 2026-10-17 23:58:12.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f8a2b6c913'
+down_revision: Union[str, None] = 'b7e2c4a91f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('songs', sa.Column('sharedDay', sa.Date(), nullable=True))
+    # 기존 데이터에 하루 두 번 이상 공유한 기록이 있을 수 있으므로 사용자별·날짜별 첫 공유에만 채움
+    op.execute("""
+        UPDATE songs SET "sharedDay" = CAST("sharedAt" AS DATE)
+        WHERE "songId" IN (
+            SELECT DISTINCT ON ("sharedBy", CAST("sharedAt" AS DATE)) "songId"
+            FROM songs
+            WHERE "sharedBy" IS NOT NULL AND "sharedAt" IS NOT NULL
+            ORDER BY "sharedBy", CAST("sharedAt" AS DATE), "sharedAt", "songId"
+        )
+    """)
+    op.create_unique_constraint('uq_songs_sharedBy_sharedDay', 'songs', ['sharedBy', 'sharedDay'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_songs_sharedBy_sharedDay', 'songs', type_='unique')
+    op.drop_column('songs', 'sharedDay')
@@ -0,0 +1,26 @@
+"""Add songs.sharedAt index
+
+Revision ID: e92b4d7f6a03
+Revises: c47a9e0b3f18
+Create Date: 2026-10-17 20:48:05.127733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e92b4d7f6a03'
+down_revision: Union[str, None] = 'c47a9e0b3f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_songs_sharedAt', 'songs', ['sharedAt'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_songs_sharedAt', table_name='songs')
@@ -0,0 +1,32 @@
+"""Add indexes for user name search
+
+Revision ID: f2b7d9a4c168
+Revises: 6a9c3e1f5b27
+Create Date: 2026-10-18 02:05:37.761903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7d9a4c168'
+down_revision: Union[str, None] = '6a9c3e1f5b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # 자모가 분리된(NFD) 한글 이름도 검색되도록 기존 이름을 NFC로 정규화 (PostgreSQL 13+)
+    op.execute("UPDATE users SET name = normalize(name, NFC) WHERE name IS NOT NFC NORMALIZED")
+    op.create_index('ix_users_name_trgm', 'users', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_users_name_lower_prefix', 'users', [sa.text('lower(name) text_pattern_ops')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_name_lower_prefix', table_name='users')
+    op.drop_index('ix_users_name_trgm', table_name='users')
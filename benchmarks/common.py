@@ -0,0 +1,90 @@
+# benchmarks/common.py
+# 벤치마크 스크립트 공용 도구. 실행: python -m benchmarks.<script>
+# DATABASE_URL의 DB에 연결하지만 모든 작업을 하나의 트랜잭션 안에서 하고 끝나면 롤백하므로 데이터가 남지 않음
+
+import statistics
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database import engine
+
+# 앱 엔진은 SQL 로그(echo)를 켜 두므로 측정 중에는 끔
+engine.sync_engine.echo = False
+
+
+@asynccontextmanager
+async def rollback_session() -> AsyncIterator[AsyncSession]:
+    """
+    바깥 트랜잭션에 묶인 세션. 측정 대상 코드가 commit해도 세이브포인트만 커밋되고 마지막에 전부 롤백됩니다.
+    """
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        try:
+            yield session
+        finally:
+            await session.close()
+            await trans.rollback()
+
+
+class StatementCounter:
+    """
+    with 블록 안에서 DB로 보낸 SQL 문 수. rollback_session 안에서는 commit이 세이브포인트 문으로 나가므로
+    세이브포인트 문(트랜잭션 제어)은 따로 셉니다.
+    """
+
+    TRANSACTION_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+    def __init__(self):
+        self.queries = 0
+        self.transaction = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith(self.TRANSACTION_PREFIXES):
+            self.transaction += 1
+        else:
+            self.queries += 1
+
+    def __enter__(self) -> "StatementCounter":
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    초 단위 측정값을 ms 단위 요약 통계로 변환
+    """
+    ms = sorted(sample * 1000 for sample in samples)
+    cuts = statistics.quantiles(ms, n=100) if len(ms) > 1 else ms * 99
+    return {
+        "runs": len(ms),
+        "mean_ms": round(statistics.mean(ms), 3),
+        "p50_ms": round(cuts[49], 3),
+        "p95_ms": round(cuts[94], 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+async def measure(fn: Callable[[], Awaitable[object]], runs: int, warmup: int = 3) -> Dict[str, float]:
+    """
+    fn을 warmup번 실행한 뒤 runs번 순서대로 실행해 지연 시간을 요약합니다.
+    """
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n== {title}")
+    for name, stats in rows.items():
+        print(f"{name:<32} " + "  ".join(f"{key}={value}" for key, value in stats.items()))
@@ -0,0 +1,102 @@
+# benchmarks/feed_rows.py
+# 피드 조회 행 경로 벤치마크: ORM 엔티티(Song, User, Track)를 만들어 dict로 옮기는 방식과
+# 필요한 컬럼만 Row 튜플로 받아 바로 직렬화하는 방식(FEED_COLUMNS + serialize_feed_row)을 1k/10k행에서 비교
+# 실행: python -m benchmarks.feed_rows --rows 1000 --rows 10000
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from sqlalchemy.future import select
+from src.models import User, Song, Track, Follow
+from src.services.feed_service import FEED_COLUMNS, serialize_feed_row
+from benchmarks.common import rollback_session, measure, print_table
+
+AUTHORS = 50
+
+
+def serialize_orm_row(song: Song, user: User) -> dict:
+    # 변경 전 피드 응답 형태 (ORM 속성에서 같은 필드를 복사)
+    return {
+        "id": user.userId,
+        "name": user.name,
+        "profileImage": user.profile_image_url,
+        "Song": {
+            "songId": song.songId,
+            "title": song.track.title,
+            "artist": song.track.artist,
+            "album_cover_url": song.track.album_cover_url,
+            "shared_at": song.sharedAt.isoformat(),
+            "reaction": song.reaction,
+            "spotify_url": song.track.spotify_url,
+            "uri": song.track.uri,
+        },
+    }
+
+
+async def seed(db, rows: int):
+    viewer_id = (await db.execute(
+        insert(User).values(email="bench-viewer@bench.invalid", hashed_pw="x", name="viewer").returning(User.userId)
+    )).scalar_one()
+    author_ids = (await db.execute(
+        insert(User).returning(User.userId),
+        [{"email": f"bench-author-{idx}@bench.invalid", "hashed_pw": "x", "name": f"author {idx}",
+          "profile_image_url": f"https://img.bench.invalid/{idx}"} for idx in range(AUTHORS)],
+    )).scalars().all()
+    await db.execute(insert(Follow), [{"follower_id": viewer_id, "following_id": author_id} for author_id in author_ids])
+
+    track_ids = (await db.execute(
+        insert(Track).returning(Track.trackId),
+        [{"uri": f"spotify:track:bench{idx}", "title": f"Title {idx}", "artist": f"Artist {idx % 500}",
+          "album": f"Album {idx % 800}", "spotify_url": f"https://open.spotify.com/track/bench{idx}",
+          "album_cover_url": f"https://i.scdn.co/image/bench{idx}"} for idx in range(rows)],
+    )).scalars().all()
+    now = datetime.utcnow()
+    await db.execute(insert(Song), [
+        {"track_id": track_id, "sharedBy": author_ids[idx % AUTHORS], "sharedAt": now - timedelta(minutes=idx), "reaction": idx % 7}
+        for idx, track_id in enumerate(track_ids)
+    ])
+    return list(author_ids)
+
+
+async def main(sizes: list, runs: int) -> None:
+    async with rollback_session() as db:
+        author_ids = await seed(db, max(sizes))
+
+        async def orm_path(limit: int):
+            db.expunge_all()  # 요청마다 새 세션인 것처럼 identity map을 비워 매번 엔티티를 만듦
+            result = await db.execute(
+                select(Song, User)
+                .join(User, Song.sharedBy == User.userId)
+                .where(Song.sharedBy.in_(author_ids))
+                .order_by(Song.sharedAt, Song.songId)
+                .limit(limit)
+            )
+            return [serialize_orm_row(song, user) for song, user in result.all()]
+
+        async def row_path(limit: int):
+            result = await db.execute(
+                select(*FEED_COLUMNS)
+                .select_from(Song)
+                .join(Track, Track.trackId == Song.track_id)
+                .join(User, Song.sharedBy == User.userId)
+                .where(Song.sharedBy.in_(author_ids))
+                .order_by(Song.sharedAt, Song.songId)
+                .limit(limit)
+            )
+            return [serialize_feed_row(row) for row in result]
+
+        results = {}
+        for size in sizes:
+            assert await orm_path(size) == await row_path(size)  # 두 경로의 응답이 같은지 먼저 확인
+            results[f"orm entities, {size} rows"] = await measure(lambda: orm_path(size), runs)
+            results[f"projected rows, {size} rows"] = await measure(lambda: row_path(size), runs)
+        print_table("feed read path", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="피드 조회 행 경로 벤치마크")
+    parser.add_argument("--rows", type=int, action="append", dest="sizes")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes or [1000, 10000], args.runs))
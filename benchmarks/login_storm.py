@@ -0,0 +1,78 @@
+# benchmarks/login_storm.py
+# 로그인 폭주 중 다른 엔드포인트의 지연 비교. 동시에 들어온 로그인 N건이 bcrypt 검증을 하는 동안
+# 가벼운 엔드포인트(GET /metrics/caches)를 계속 호출해 응답 지연을 잰다.
+# 변경 전: 이벤트 루프에서 바로 pwd_context.verify (검증하는 동안 다른 요청이 모두 멈춤)
+# 변경 후: verify_password_async (전용 스레드 풀에서 검증)
+# DB를 쓰지 않으므로 DATABASE_URL은 import용 값이면 충분
+# 실행: python -m benchmarks.login_storm --logins 20
+
+import argparse
+import asyncio
+import time
+import httpx
+from src.main import app
+from src.auth.security import get_password_hash, verify_password, verify_password_async
+from benchmarks.common import summarize, print_table
+
+PROBE_INTERVAL_SECONDS = 0.005
+
+
+async def probe(client: httpx.AsyncClient, done: asyncio.Event) -> list:
+    """
+    done이 설정될 때까지 PROBE_INTERVAL_SECONDS 간격의 예정 시각마다 프로브 요청을 보내고 지연(초)을 모읍니다.
+    이벤트 루프가 막혀 예정 시각에 보내지 못한 요청도 예정 시각부터 응답까지를 지연으로 셉니다.
+    """
+    samples = []
+    next_at = time.perf_counter()
+    while not done.is_set():
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        response = await client.get("/metrics/caches")
+        response.raise_for_status()
+        finished = time.perf_counter()
+        while next_at <= finished:
+            samples.append(finished - next_at)
+            next_at += PROBE_INTERVAL_SECONDS
+    return samples
+
+
+async def run_storm(client: httpx.AsyncClient, login, logins: int) -> dict:
+    done = asyncio.Event()
+    probe_task = asyncio.ensure_future(probe(client, done))
+    await asyncio.sleep(PROBE_INTERVAL_SECONDS)  # 프로브가 먼저 돌기 시작하도록
+    started = time.perf_counter()
+    if login is None:
+        await asyncio.sleep(1.0)  # 로그인 없이 유휴 상태 기준선
+    else:
+        assert all(await asyncio.gather(*[login() for _ in range(logins)]))
+    elapsed = time.perf_counter() - started
+    done.set()
+    stats = summarize(await probe_task)
+    stats["storm_seconds"] = round(elapsed, 3)
+    return stats
+
+
+async def main(logins: int) -> None:
+    password = "bench-password"
+    hashed = get_password_hash(password)
+
+    async def inline_login():
+        await asyncio.sleep(0)  # 요청 처리 중 한 번은 루프에 양보한다고 가정
+        return verify_password(password, hashed)
+
+    async def pooled_login():
+        return await verify_password_async(password, hashed)
+
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for label, login in (("idle", None), ("inline verify (before)", inline_login), ("thread pool (after)", pooled_login)):
+            results[label] = await run_storm(client, login, logins)
+    print_table(f"probe latency during {logins} concurrent logins", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로그인 폭주 중 다른 엔드포인트 지연 벤치마크")
+    parser.add_argument("--logins", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins))
@@ -0,0 +1,47 @@
+# benchmarks/principal_cache.py
+# 인증 의존성(get_current_user)의 요청당 비용을 principal 캐시 미스/히트로 비교
+# 미스(변경 전과 같은 경로): JWT 서명 검증 + 이메일로 사용자 SELECT
+# 히트: 서명 검증 생략 + 기본 키로 사용자 조회
+# 실행: python -m benchmarks.principal_cache --runs 500
+
+import argparse
+import asyncio
+from sqlalchemy import insert
+from src.auth.auth import create_access_token
+from src.auth.dependencies import get_current_user, principal_cache
+from src.models import User
+from benchmarks.common import rollback_session, measure, print_table, StatementCounter
+
+
+async def main(runs: int) -> None:
+    async with rollback_session() as db:
+        email = "bench-principal@bench.invalid"
+        await db.execute(insert(User).values(email=email, hashed_pw="x", name="bench principal"))
+        token = create_access_token(data={"sub": email})
+
+        # 매 요청이 새 세션인 것처럼 identity map을 비워 db.get도 실제로 DB를 조회하게 함
+        async def cold():
+            principal_cache.clear()
+            db.expunge_all()
+            return await get_current_user(token, db)
+
+        async def warm():
+            db.expunge_all()
+            return await get_current_user(token, db)
+
+        results = {}
+        for label, fn in (("cache miss (jwt + email select)", cold), ("cache hit (pk get)", warm)):
+            stats = await measure(fn, runs)
+            with StatementCounter() as counter:
+                await fn()
+            stats["queries_per_request"] = counter.queries
+            results[label] = stats
+        principal_cache.clear()
+        print_table("get_current_user", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="principal 캐시 벤치마크")
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
@@ -0,0 +1,58 @@
+# benchmarks/user_search.py
+# 사용자 이름 검색 벤치마크: 대량(기본 100만 명)의 한글/영문 이름을 넣고 검색 지연을 측정
+# 실행: python -m benchmarks.user_search --users 1000000
+# 트라이그램을 타는 3글자 이상 검색어와, 스캔하는 한두 글자 검색어("민수")를 함께 비교합니다.
+
+import argparse
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.future import select
+from src.crud import search_user_by_name
+from src.models import User
+from benchmarks.common import rollback_session, measure, print_table
+
+SURNAMES = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임"]
+GIVEN = ["민", "수", "지", "현", "준", "서", "영", "호", "진", "우", "예", "은"]
+
+SEED_USERS = text("""
+    INSERT INTO users (email, hashed_pw, name, "createdAt")
+    SELECT
+        'bench-' || g || '@bench.invalid',
+        'x',
+        CASE WHEN g % 10 = 0
+            THEN (ARRAY['kim', 'lee', 'park', 'choi', 'jung'])[1 + g % 5] || ' ' || substr(md5(g::text), 1, 6)
+            ELSE (CAST(:surnames AS text[]))[1 + floor(random() * cardinality(CAST(:surnames AS text[])))::int]
+                 || (CAST(:given AS text[]))[1 + floor(random() * cardinality(CAST(:given AS text[])))::int]
+                 || (CAST(:given AS text[]))[1 + floor(random() * cardinality(CAST(:given AS text[])))::int]
+        END,
+        now()
+    FROM generate_series(1, :users) AS g
+""")
+
+
+async def main(users: int, runs: int, queries: list) -> None:
+    async with rollback_session() as db:
+        print(f"seeding {users} users ...")
+        await db.execute(SEED_USERS, {"users": users, "surnames": SURNAMES, "given": GIVEN})
+        await db.execute(text("ANALYZE users"))
+
+        results = {}
+        for query in queries:
+            page, _ = await search_user_by_name(db, query, limit=20)
+            results[f"search {query!r} ({len(page)} hits)"] = await measure(
+                lambda: search_user_by_name(db, query, limit=20), runs
+            )
+            # 변경 전 방식: 정렬 없는 ILIKE '%검색어%' (비교용)
+            results[f"baseline ilike {query!r}"] = await measure(
+                lambda: db.execute(select(User).where(User.name.ilike(f"%{query}%")).limit(20)), runs
+            )
+        print_table(f"user name search, {users} users", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="사용자 이름 검색 벤치마크")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--query", action="append", dest="queries")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.runs, args.queries or ["민수", "김민수", "kim", "kim a1"]))
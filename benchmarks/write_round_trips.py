@@ -0,0 +1,186 @@
+# benchmarks/write_round_trips.py
+# 쓰기 엔드포인트(공유, 팔로우, 프로필 수정)의 요청당 DB 왕복 수를 변경 전/후로 비교
+# 변경 전: 공유는 오늘 공유 여부 SELECT -> ORM add, 팔로우는 ORM add, 프로필 수정은 조회 후 수정 -> 모두 commit 후 refresh
+# 변경 후: INSERT/UPDATE ... RETURNING 한 번 + commit
+# 실행: python -m benchmarks.write_round_trips --requests 20
+
+import argparse
+import asyncio
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict
+import httpx
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.future import select
+from src.main import app
+from src.database import get_db
+from src.auth.dependencies import get_current_user
+from src.auth.security import get_password_hash_async
+from src.crud import normalize_name
+from src.models import User, Follow, Song
+from src.routers import songs as songs_router, users as users_router
+from src.services.feed_service import fanout_follow, fanout_share
+from src.services.chart_service import record_share
+from src.services.track_service import track_uri_for, upsert_track
+from benchmarks.common import rollback_session, StatementCounter, print_table
+
+
+# ---- 변경 전 쓰기 방식 (비교용으로 그대로 재현) ----
+
+async def legacy_add_follow(db, follower_id: int, following_id: int):
+    follow = Follow(follower_id=follower_id, following_id=following_id)
+    db.add(follow)
+    await fanout_follow(db, follower_id, following_id)
+    await db.commit()
+    await db.refresh(follow)
+    return follow
+
+
+async def legacy_update_user_profile(db, user_id: int, user_update):
+    result = await db.execute(select(User).where(User.userId == user_id))
+    user = result.scalars().first()
+    if not user:
+        return None
+    if user_update.email:
+        user.email = user_update.email
+    if user_update.password:
+        user.hashed_pw = await get_password_hash_async(user_update.password)
+    if user_update.name:
+        user.name = normalize_name(user_update.name)
+    if user_update.profile_image_url:
+        user.profile_image_url = user_update.profile_image_url
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+
+async def legacy_share_song(db, user_id: int, song_title: str, artist: str, album: str, spotify_url: str, album_cover_url: str, uri: str):
+    # 변경 전 공유 순서: 오늘 공유했는지 먼저 SELECT -> ORM add -> commit -> refresh
+    # (지금 스키마에 맞춰 트랙 upsert와 인박스·차트 집계 반영은 현재 코드와 같게 둠)
+    today = datetime.utcnow().date()
+    result = await db.execute(select(Song).where(Song.sharedBy == user_id, Song.sharedAt >= today))
+    if result.scalars().first():
+        raise HTTPException(status_code=400, detail="You have already shared song today.")
+
+    track = await upsert_track(
+        db,
+        uri=track_uri_for(uri, spotify_url),
+        title=song_title,
+        artist=artist,
+        album=album,
+        spotify_url=spotify_url,
+        album_cover_url=album_cover_url,
+    )
+    shared_at = datetime.utcnow()
+    shared_song = Song(track=track, sharedBy=user_id, sharedAt=shared_at, sharedDay=shared_at.date(), reaction=0)
+    db.add(shared_song)
+    await db.flush()  # 인박스·집계에 songId가 필요
+    await fanout_share(db, shared_song)
+    await record_share(db, shared_song)
+    await db.commit()
+    await db.refresh(shared_song)
+    return shared_song
+
+
+@contextmanager
+def legacy_helpers():
+    patches = [
+        (users_router, "add_follow", legacy_add_follow),
+        (users_router, "update_user_profile", legacy_update_user_profile),
+        (songs_router, "share_song", legacy_share_song),
+    ]
+    originals = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    for module, name, replacement in patches:
+        setattr(module, name, replacement)
+    try:
+        yield
+    finally:
+        for module, name, original in originals:
+            setattr(module, name, original)
+
+
+# ---- 측정 ----
+
+async def create_users(db, prefix: str, count: int):
+    user_ids = (await db.execute(
+        insert(User).returning(User.userId),
+        [{"email": f"bench-{prefix}-{idx}@bench.invalid", "hashed_pw": "x", "name": f"{prefix} {idx}"} for idx in range(count)],
+    )).scalars().all()
+    return [await db.get(User, user_id) for user_id in user_ids]
+
+
+async def run_endpoint(client, db, acting, requests) -> Dict[str, float]:
+    """
+    (acting user, method, url, json) 요청들을 순서대로 보내고 요청당 평균 SQL 문 수와 지연을 계산합니다.
+    """
+    elapsed = 0.0
+    with StatementCounter() as counter:
+        for user, method, url, body in requests:
+            acting["user"] = user
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            elapsed += time.perf_counter() - started
+            response.raise_for_status()
+    return {
+        "queries_per_request": round(counter.queries / len(requests), 2),
+        "savepoints_per_request": round(counter.transaction / len(requests), 2),  # 커밋 1번 = RELEASE + 다음 SAVEPOINT
+        "mean_ms": round(elapsed / len(requests) * 1000, 3),
+    }
+
+
+async def main(request_count: int) -> None:
+    async with rollback_session() as db:
+        acting = {"user": None}
+
+        async def override_get_db():
+            yield db
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_current_user] = lambda: acting["user"]
+
+        results = {}
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+                for label in ("before", "after"):
+                    users = await create_users(db, label, request_count + 1)
+                    follower, targets = users[0], users[1:]
+                    await db.commit()
+
+                    share_requests = [
+                        (user, "POST", f"/songs/spotify:track:bench{label}{idx}/share", {
+                            "title": f"Bench {idx}", "artist": "Bench", "album": "Bench",
+                            "spotify_url": f"https://open.spotify.com/track/bench{label}{idx}",
+                            "album_cover_url": None, "uri": f"spotify:track:bench{label}{idx}",
+                        })
+                        for idx, user in enumerate(targets)
+                    ]
+                    follow_requests = [
+                        (follower, "POST", f"/users/{target.userId}/follow", {"follower_id": follower.userId})
+                        for target in targets
+                    ]
+                    profile_requests = [
+                        (user, "PUT", f"/users/profile/{user.userId}",
+                         {"email": None, "password": None, "name": f"renamed {idx}", "profile_image_url": None})
+                        for idx, user in enumerate(targets)
+                    ]
+
+                    if label == "before":
+                        with legacy_helpers():
+                            measured = [await run_endpoint(client, db, acting, reqs) for reqs in (share_requests, follow_requests, profile_requests)]
+                    else:
+                        measured = [await run_endpoint(client, db, acting, reqs) for reqs in (share_requests, follow_requests, profile_requests)]
+                    for endpoint, stats in zip(("share", "follow", "profile update"), measured):
+                        results[f"{endpoint} ({label})"] = stats
+        finally:
+            app.dependency_overrides.clear()
+
+        print_table(f"write round trips, {request_count} requests each", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="쓰기 엔드포인트 왕복 수 벤치마크")
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
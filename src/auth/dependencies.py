@@ -1,3 +1,5 @@
+import hashlib
+import time
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
@@ -6,6 +8,7 @@ from sqlalchemy.future import select
 from src.config.config import load_config
 from src.models import User
 from src.database import get_db
+from src.utils.cache import TTLCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auths/login")
 
@@ -13,12 +16,35 @@ config = load_config()
 SECRET_KEY = config["SECRET_KEY"]
 ALGORITHM = config["ALGORITHM"]
 
+# 검증이 끝난 토큰 -> (userId, 토큰 만료 시각). 토큰 원문 대신 해시를 키로 사용
+principal_cache = TTLCache(
+    "principals",
+    maxsize=config["PRINCIPAL_CACHE_SIZE"],
+    ttl=config["PRINCIPAL_CACHE_TTL_SECONDS"],
+)
+
+def invalidate_principal_cache(user_id: int) -> None:
+    """
+    사용자의 캐시된 인증 정보를 모두 버립니다. (이메일/비밀번호 변경 시 호출)
+    """
+    principal_cache.invalidate_group(user_id)
+
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=401,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    token_key = hashlib.sha256(token.encode()).hexdigest()
+    cached = principal_cache.get(token_key)
+    if cached is not None and cached[1] > time.time():
+        # 이미 검증한 토큰이면 서명 검증을 생략하고 기본 키로 사용자 조회
+        user = await db.get(User, cached[0])
+        if user is None:
+            principal_cache.invalidate(token_key)
+            raise credentials_exception
+        return user
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -31,4 +57,5 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
     user = result.scalars().first()
     if user is None:
         raise credentials_exception
+    principal_cache.set(token_key, (user.userId, payload.get("exp", float("inf"))), group=user.userId)
     return user
\ No newline at end of file
@@ -1,9 +1,68 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
+from src.config.config import load_config
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+config = load_config()
+
+# bcrypt는 해싱 중 GIL을 놓으므로 스레드 풀로 충분. 워커 수가 동시에 실행되는 해싱 수의 상한
+PASSWORD_HASH_WORKERS = config["PASSWORD_HASH_WORKERS"]
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+
+# 대기열/실행 시간 통계 (/metrics/auth)
+_stats_lock = threading.Lock()  # 워커 스레드들이 함께 갱신
+_stats = {"queued": 0, "running": 0, "completed": 0, "wait_seconds": 0.0, "run_seconds": 0.0, "max_wait_seconds": 0.0}
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
+
+async def _run_in_hash_pool(func, *args):
+    """
+    bcrypt 연산을 이벤트 루프 밖의 전용 스레드 풀에서 실행합니다. (대기 중에도 다른 요청은 계속 처리됨)
+    """
+    submitted = time.monotonic()
+    with _stats_lock:
+        _stats["queued"] += 1
+
+    def run():
+        started = time.monotonic()
+        with _stats_lock:
+            _stats["queued"] -= 1
+            _stats["running"] += 1
+        try:
+            return func(*args)
+        finally:
+            wait = started - submitted
+            with _stats_lock:
+                _stats["running"] -= 1
+                _stats["completed"] += 1
+                _stats["wait_seconds"] += wait
+                _stats["max_wait_seconds"] = max(_stats["max_wait_seconds"], wait)
+                _stats["run_seconds"] += time.monotonic() - started
+
+    return await asyncio.get_event_loop().run_in_executor(_hash_executor, run)
+
+async def verify_password_async(plain_password, hashed_password):
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await _run_in_hash_pool(get_password_hash, password)
+
+def password_hash_stats() -> dict:
+    completed = _stats["completed"]
+    return {
+        "workers": PASSWORD_HASH_WORKERS,
+        "queued": _stats["queued"],
+        "running": _stats["running"],
+        "completed": completed,
+        "avg_wait_seconds": round(_stats["wait_seconds"] / completed, 4) if completed else None,
+        "max_wait_seconds": round(_stats["max_wait_seconds"], 4),
+        "avg_run_seconds": round(_stats["run_seconds"] / completed, 4) if completed else None,
+    }
@@ -9,9 +9,38 @@ def load_config():
 
     client_id = os.getenv("SPOTIFY_CLIENT_ID")
     client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
+    SPOTIFY_API_BASE_URL = os.getenv("SPOTIFY_API_BASE_URL", "https://api.spotify.com")  # 로컬 스텁 서버로 바꿔 테스트 가능
+    SPOTIFY_ACCOUNTS_BASE_URL = os.getenv("SPOTIFY_ACCOUNTS_BASE_URL", "https://accounts.spotify.com")
+    SPOTIFY_TIMEOUT_SECONDS = float(os.getenv("SPOTIFY_TIMEOUT_SECONDS", 5))
+    SPOTIFY_RATE_LIMIT_PER_SECOND = float(os.getenv("SPOTIFY_RATE_LIMIT_PER_SECOND", 20))  # 클라이언트 측 초당 호출 한도
+    SPOTIFY_MAX_WAIT_SECONDS = float(os.getenv("SPOTIFY_MAX_WAIT_SECONDS", 2))  # 이보다 오래 기다려야 하면 바로 503
+    SPOTIFY_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("SPOTIFY_CIRCUIT_FAILURE_THRESHOLD", 5))
+    SPOTIFY_CIRCUIT_RESET_SECONDS = float(os.getenv("SPOTIFY_CIRCUIT_RESET_SECONDS", 30))
+    TRACK_CACHE_SIZE = int(os.getenv("TRACK_CACHE_SIZE", 5000))
+    TRACK_CACHE_TTL_SECONDS = float(os.getenv("TRACK_CACHE_TTL_SECONDS", 86400))
+    TRACK_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv("TRACK_CACHE_NEGATIVE_TTL_SECONDS", 300))  # 없는 트랙 캐시 시간
+    TRACK_CACHE_PATH = os.getenv("TRACK_CACHE_PATH", "")  # 비어 있으면 디스크에 저장하지 않음
+    SPOTIFY_BATCH_WINDOW_MS = float(os.getenv("SPOTIFY_BATCH_WINDOW_MS", 10))  # 트랙 조회를 모아 보내는 대기 시간
+    SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", 2000))  # 캐시할 검색어 수
+    SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", 600))
+    LOCAL_SEARCH_MIN_RESULTS = int(os.getenv("LOCAL_SEARCH_MIN_RESULTS", 10))  # 로컬 카탈로그 결과가 이보다 적으면 Spotify 검색
     secret_key = os.getenv("SECRET_KEY")
     algorithm = os.getenv("ALGORITHM")
     SCHEDULER_CRON_HOUR = int(os.getenv("SCHEDULER_CRON_HOUR", 0))
+    PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))  # 캐시할 인증 토큰 수 (0이면 비활성화)
+    PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 4))  # 동시에 실행할 bcrypt 연산 수
+    PROFILE_COUNTS_CACHE_SIZE = int(os.getenv("PROFILE_COUNTS_CACHE_SIZE", 10000))  # 캐시할 프로필 집계 수 (0이면 비활성화)
+    PROFILE_COUNTS_CACHE_TTL_SECONDS = float(os.getenv("PROFILE_COUNTS_CACHE_TTL_SECONDS", 300))
+    FEED_FANOUT_ENABLED = os.getenv("FEED_FANOUT_ENABLED", "false").lower() == "true"  # false면 기존 pull 쿼리 사용
+    FEED_CACHE_SIZE = int(os.getenv("FEED_CACHE_SIZE", 10000))  # 캐시할 피드 페이지 수 (0이면 비활성화)
+    FEED_CACHE_TTL_SECONDS = float(os.getenv("FEED_CACHE_TTL_SECONDS", 60))  # 무효화를 놓쳐도 이 시간이 지나면 다시 조회
+    CHART_SNAPSHOT_INTERVAL_MINUTES = int(os.getenv("CHART_SNAPSHOT_INTERVAL_MINUTES", 10))
+    CHART_SNAPSHOT_RETENTION_HOURS = float(os.getenv("CHART_SNAPSHOT_RETENTION_HOURS", 24))  # 이보다 오래된 스냅샷은 기간·날짜별 마지막 하나만 남김
+    CHART_CACHE_TTL_SECONDS = float(os.getenv("CHART_CACHE_TTL_SECONDS", 60))
+    CHART_CACHE_SERVE_STALE = os.getenv("CHART_CACHE_SERVE_STALE", "true").lower() == "true"  # 만료된 차트를 응답하며 백그라운드 갱신
+    REACTION_BUFFER_ENABLED = os.getenv("REACTION_BUFFER_ENABLED", "true").lower() == "true"  # false면 리액션마다 바로 UPDATE
+    REACTION_FLUSH_INTERVAL_MS = int(os.getenv("REACTION_FLUSH_INTERVAL_MS", 300))
 
 
     if not client_id or not client_secret:
@@ -22,7 +51,36 @@ def load_config():
     return {
         "SPOTIFY_CLIENT_ID": client_id,
         "SPOTIFY_CLIENT_SECRET": client_secret,
+        "SPOTIFY_API_BASE_URL": SPOTIFY_API_BASE_URL,
+        "SPOTIFY_ACCOUNTS_BASE_URL": SPOTIFY_ACCOUNTS_BASE_URL,
+        "SPOTIFY_TIMEOUT_SECONDS": SPOTIFY_TIMEOUT_SECONDS,
+        "SPOTIFY_RATE_LIMIT_PER_SECOND": SPOTIFY_RATE_LIMIT_PER_SECOND,
+        "SPOTIFY_MAX_WAIT_SECONDS": SPOTIFY_MAX_WAIT_SECONDS,
+        "SPOTIFY_CIRCUIT_FAILURE_THRESHOLD": SPOTIFY_CIRCUIT_FAILURE_THRESHOLD,
+        "SPOTIFY_CIRCUIT_RESET_SECONDS": SPOTIFY_CIRCUIT_RESET_SECONDS,
+        "TRACK_CACHE_SIZE": TRACK_CACHE_SIZE,
+        "TRACK_CACHE_TTL_SECONDS": TRACK_CACHE_TTL_SECONDS,
+        "TRACK_CACHE_NEGATIVE_TTL_SECONDS": TRACK_CACHE_NEGATIVE_TTL_SECONDS,
+        "TRACK_CACHE_PATH": TRACK_CACHE_PATH,
+        "SPOTIFY_BATCH_WINDOW_MS": SPOTIFY_BATCH_WINDOW_MS,
+        "SEARCH_CACHE_SIZE": SEARCH_CACHE_SIZE,
+        "SEARCH_CACHE_TTL_SECONDS": SEARCH_CACHE_TTL_SECONDS,
+        "LOCAL_SEARCH_MIN_RESULTS": LOCAL_SEARCH_MIN_RESULTS,
         "SECRET_KEY": secret_key,
         "ALGORITHM": algorithm,
-        "SCHEDULER_CRON_HOUR": SCHEDULER_CRON_HOUR
+        "SCHEDULER_CRON_HOUR": SCHEDULER_CRON_HOUR,
+        "PRINCIPAL_CACHE_SIZE": PRINCIPAL_CACHE_SIZE,
+        "PRINCIPAL_CACHE_TTL_SECONDS": PRINCIPAL_CACHE_TTL_SECONDS,
+        "PASSWORD_HASH_WORKERS": PASSWORD_HASH_WORKERS,
+        "PROFILE_COUNTS_CACHE_SIZE": PROFILE_COUNTS_CACHE_SIZE,
+        "PROFILE_COUNTS_CACHE_TTL_SECONDS": PROFILE_COUNTS_CACHE_TTL_SECONDS,
+        "FEED_FANOUT_ENABLED": FEED_FANOUT_ENABLED,
+        "FEED_CACHE_SIZE": FEED_CACHE_SIZE,
+        "FEED_CACHE_TTL_SECONDS": FEED_CACHE_TTL_SECONDS,
+        "CHART_SNAPSHOT_INTERVAL_MINUTES": CHART_SNAPSHOT_INTERVAL_MINUTES,
+        "CHART_SNAPSHOT_RETENTION_HOURS": CHART_SNAPSHOT_RETENTION_HOURS,
+        "CHART_CACHE_TTL_SECONDS": CHART_CACHE_TTL_SECONDS,
+        "CHART_CACHE_SERVE_STALE": CHART_CACHE_SERVE_STALE,
+        "REACTION_BUFFER_ENABLED": REACTION_BUFFER_ENABLED,
+        "REACTION_FLUSH_INTERVAL_MS": REACTION_FLUSH_INTERVAL_MS
     }
\ No newline at end of file
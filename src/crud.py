@@ -4,48 +4,62 @@ from sqlite3 import IntegrityError
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import func, insert, update, case, cast, or_, and_, Numeric
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime, timedelta
-from src.models import User, Song, Follow, Playlist, playlist_songs
-from typing import Optional, List
+from src.models import User, Song, Track, Follow, Playlist, playlist_songs
+from typing import Optional, List, Dict, Tuple
+from decimal import Decimal, InvalidOperation
+import base64
+import unicodedata
 from src.schemas import PlaylistCreate, PlaylistResponse, UserUpdate
-from src.auth.security import get_password_hash
+from src.auth.security import get_password_hash_async
+from src.services.feed_service import fanout_share, fanout_follow
+from src.services.chart_service import record_share
+from src.services.track_service import track_uri_for, upsert_track
 import logging
 
 logger = logging.getLogger(__name__)
 
 async def create_user(db: AsyncSession, email: str, hashed_password: str, name: str, profile_image_url: Optional[str] = None):
-    user = User(
-        email=email,
-        hashed_pw=hashed_password,  # 컬럼명이 변경됨
-        name=name,
-        profile_image_url=profile_image_url  # 프로필 이미지 URL 설정
+    # INSERT ... RETURNING으로 생성된 행을 바로 받아 커밋 후 refresh 조회를 생략
+    result = await db.execute(
+        insert(User)
+        .values(
+            email=email,
+            hashed_pw=hashed_password,  # 컬럼명이 변경됨
+            name=normalize_name(name),
+            profile_image_url=profile_image_url  # 프로필 이미지 URL 설정
+        )
+        .returning(User)
     )
-    db.add(user)
+    user = result.scalar_one()
     await db.commit()
-    await db.refresh(user)
     return user
 
 async def update_user_profile(db: AsyncSession, user_id: int, user_update: UserUpdate):
-    result = await db.execute(select(User).where(User.userId == user_id))
-    user = result.scalars().first()
-
-    if not user:
-        return None
-
     # 업데이트할 데이터만 갱신
+    changes = {}
     if user_update.email:
-        user.email = user_update.email
+        changes["email"] = user_update.email
     if user_update.password:
-        user.hashed_pw = get_password_hash(user_update.password)
+        changes["hashed_pw"] = await get_password_hash_async(user_update.password)
     if user_update.name:
-        user.name = user_update.name
+        changes["name"] = normalize_name(user_update.name)
     if user_update.profile_image_url:
-        user.profile_image_url = user_update.profile_image_url
+        changes["profile_image_url"] = user_update.profile_image_url
+
+    if not changes:
+        return await db.get(User, user_id)
 
+    # 조회 없이 UPDATE ... RETURNING 한 번으로 갱신하고 결과 행을 받음 (없는 사용자면 None)
+    result = await db.execute(
+        update(User).where(User.userId == user_id).values(**changes).returning(User),
+        execution_options={"populate_existing": True},
+    )
+    user = result.scalar_one_or_none()
     await db.commit()
-    await db.refresh(user)
 
     return user
 
@@ -53,123 +67,93 @@ async def get_user_by_email(db: AsyncSession, email: str):
     result = await db.execute(select(User).filter(User.email == email))
     return result.scalars().first()
 
-async def search_user_by_name(db: AsyncSession, name: str) -> List[User]:
-    result = await db.execute(select(User).filter(User.name.ilike(f"%{name}%")))
-    return result.scalars().all()
+def normalize_name(name: str) -> str:
+    """
+    이름을 NFC로 정규화합니다. (macOS 등에서 자모가 분리된 NFD 한글로 들어와도 같은 이름으로 검색되도록)
+    """
+    return unicodedata.normalize("NFC", name)
+
+def _encode_search_cursor(score: Decimal, user_id: int) -> str:
+    raw = f"{score}|{user_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_search_cursor(cursor: str) -> Tuple[Decimal, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, user_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return Decimal(score), int(user_id)
+    except (ValueError, UnicodeDecodeError, InvalidOperation):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def search_user_by_name(
+    db: AsyncSession,
+    name: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    exclude_user_id: Optional[int] = None,
+) -> Tuple[List[User], Optional[str]]:
+    """
+    이름으로 사용자를 검색해 (사용자 목록, 다음 페이지 커서)를 반환합니다.
+    정확히 일치 > 앞부분 일치 > 트라이그램 유사도 순으로 점수를 매기고 (점수, userId) 키셋으로 페이지를 나눕니다.
+    """
+    query = " ".join(normalize_name(name).split()).lower()
+    if not query:
+        return [], None
+
+    lower_name = func.lower(User.name)
+    prefix = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    # 검색어가 이름 어디에 있어도 찾음 ("민수"로 "김민수" 검색). 3글자 이상이면 트라이그램 인덱스를 타고,
+    # 한두 글자는 트라이그램이 만들어지지 않아 스캔하지만 점수 순 LIMIT으로 응답 크기는 제한됨
+    matches = User.name.ilike(f"%{prefix}")
+
+    score = func.round(
+        cast(
+            case((lower_name == query, 2), else_=0)
+            + case((lower_name.like(prefix), 1), else_=0)
+            + func.similarity(User.name, query),
+            Numeric,
+        ),
+        4,
+    )
+    stmt = select(User, score.label("score")).where(matches)
+    if exclude_user_id is not None:
+        stmt = stmt.where(User.userId != exclude_user_id)
+    if cursor:
+        cursor_score, cursor_user_id = _decode_search_cursor(cursor)
+        stmt = stmt.where(or_(score < cursor_score, and_(score == cursor_score, User.userId > cursor_user_id)))
+
+    result = await db.execute(stmt.order_by(score.desc(), User.userId).limit(limit + 1))
+    rows = result.all()
+    users = [row.User for row in rows[:limit]]
+    next_cursor = _encode_search_cursor(rows[limit - 1].score, rows[limit - 1].User.userId) if len(rows) > limit else None
+    return users, next_cursor
 
 async def add_follow(db: AsyncSession, follower_id: int, following_id: int):
-    follow = Follow(follower_id=follower_id, following_id=following_id)
-    db.add(follow)
+    result = await db.execute(
+        insert(Follow).values(follower_id=follower_id, following_id=following_id).returning(Follow)
+    )
+    follow = result.scalar_one()
+    await fanout_follow(db, follower_id, following_id)  # 피드 인박스 채우기
     await db.commit()
-    await db.refresh(follow)
     return follow
 
 
 async def create_song(db: AsyncSession, title: str, artist: str, album: str, spotify_url: str, shared_by: int):
-    song = Song(
+    track = await upsert_track(
+        db,
+        uri=track_uri_for(None, spotify_url),
         title=title,
         artist=artist,
         album=album,
         spotify_url=spotify_url,
-        sharedBy=shared_by  # 컬럼명이 변경됨
-    )
-    db.add(song)
-    await db.commit()
-    await db.refresh(song)
-    return song
-
-
-async def get_daily_chart(db: AsyncSession):
-    """ 일간 차트: 하루 동안 공유된 노래의 공유 횟수를 집계하고 순위를 부여합니다. """
-    today = datetime.utcnow().date()
-    result = await db.execute(
-        select(Song.title, Song.artist, Song.uri, Song.album_cover_url, func.count(Song.songId).label('share_count'))
-        .filter(func.date(Song.sharedAt) == today)
-        .group_by(Song.title, Song.artist, Song.uri, Song.album_cover_url)
-        .order_by(func.count(Song.songId).desc())
     )
-    # 순위를 기반으로 ID 추가
-    chart_data = result.fetchmany(50)
-    return [
-        {
-            "rank": idx + 1,  # 순위 기반 ID
-            "title": row.title,
-            "artist": row.artist,
-            "uri": row.uri,
-            "album_cover_url": row.album_cover_url,
-            "share_count": row.share_count
-        }
-        for idx, row in enumerate(chart_data)
-    ]
-
-async def get_weekly_chart(db: AsyncSession):
-    """ 주간 차트: 일주일 동안 공유된 노래의 공유 횟수를 집계하고 순위를 부여합니다. """
-    start_of_week = datetime.utcnow().date() - timedelta(days=datetime.utcnow().date().weekday())
     result = await db.execute(
-        select(Song.title, Song.artist, Song.uri, Song.album_cover_url, func.count(Song.songId).label('share_count'))
-        .filter(func.date(Song.sharedAt) >= start_of_week)
-        .group_by(Song.title, Song.artist, Song.uri, Song.album_cover_url)
-        .order_by(func.count(Song.songId).desc())
+        insert(Song).values(track_id=track.trackId, sharedBy=shared_by).returning(Song)  # 컬럼명이 변경됨
     )
-    # 순위를 기반으로 ID 추가
-    chart_data = result.fetchmany(50)
-    return [
-        {
-            "rank": idx + 1,  # 순위 기반 ID
-            "title": row.title,
-            "artist": row.artist,
-            "uri": row.uri,
-            "album_cover_url": row.album_cover_url,
-            "share_count": row.share_count
-        }
-        for idx, row in enumerate(chart_data)
-    ]
-
-
-async def get_monthly_chart(db: AsyncSession):
-    """ 월간 차트: 한 달 동안 공유된 노래의 공유 횟수를 집계하고 순위를 부여합니다. """
-    start_of_month = datetime.utcnow().replace(day=1).date()
-    result = await db.execute(
-        select(Song.title, Song.artist, Song.uri, Song.album_cover_url, func.count(Song.songId).label('share_count'))
-        .filter(func.date(Song.sharedAt) >= start_of_month)
-        .group_by(Song.title, Song.artist, Song.uri, Song.album_cover_url)
-        .order_by(func.count(Song.songId).desc())
-    )
-    # 순위를 기반으로 ID 추가
-    chart_data = result.fetchmany(50)
-    return [
-        {
-            "rank": idx + 1,  # 순위 기반 ID
-            "title": row.title,
-            "artist": row.artist,
-            "uri": row.uri,
-            "album_cover_url": row.album_cover_url,
-            "share_count": row.share_count
-        }
-        for idx, row in enumerate(chart_data)
-    ]
-async def get_yearly_chart(db: AsyncSession):
-    """ 연간 차트: 한 해 동안 공유된 노래의 공유 횟수를 집계하고 순위를 부여합니다. """
-    start_of_year = datetime.utcnow().replace(month=1, day=1).date()  # 해당 연도의 시작 날짜
-    result = await db.execute(
-        select(Song.title, Song.artist, Song.uri, Song.album_cover_url, func.count(Song.songId).label('share_count'))
-        .filter(func.date(Song.sharedAt) >= start_of_year)
-        .group_by(Song.title, Song.artist, Song.uri, Song.album_cover_url)
-        .order_by(func.count(Song.songId).desc())
-    )
-    # 순위를 기반으로 ID 추가
-    chart_data = result.fetchmany(50)
-    return [
-        {
-            "rank": idx + 1,  # 순위 기반 ID
-            "title": row.title,
-            "artist": row.artist,
-            "uri": row.uri,
-            "album_cover_url": row.album_cover_url,
-            "share_count": row.share_count
-        }
-        for idx, row in enumerate(chart_data)
-    ]
+    song = result.scalar_one()
+    set_committed_value(song, "track", track)
+    await db.commit()
+    return song
 
 
 async def share_song(
@@ -182,22 +166,60 @@ async def share_song(
     album_cover_url: str,
     uri: str
 ):
-    shared_song = Song(
+    # 곡 정보는 tracks 테이블에 한 번만 저장하고 공유 기록은 trackId로 참조
+    track = await upsert_track(
+        db,
+        uri=track_uri_for(uri, spotify_url),
         title=song_title,
         artist=artist,
         album=album,
         spotify_url=spotify_url,
         album_cover_url=album_cover_url,
-        uri=uri,
-        sharedBy=user_id,  # 컬럼명이 변경됨
-        sharedAt=datetime.utcnow()  # 컬럼명이 변경됨
     )
-    
-    db.add(shared_song)
-    await db.commit()  # 비동기 커밋
-    await db.refresh(shared_song)
+    # 하루 한 번 제한은 (sharedBy, sharedDay) 유니크 제약으로 보장: 이미 공유했으면 아무 행도 반환되지 않음
+    shared_at = datetime.utcnow()
+    result = await db.execute(
+        pg_insert(Song)
+        .values(track_id=track.trackId, sharedBy=user_id, sharedAt=shared_at, sharedDay=shared_at.date(), reaction=0)
+        .on_conflict_do_nothing(constraint="uq_songs_sharedBy_sharedDay")
+        .returning(Song)
+    )
+    shared_song = result.scalar_one_or_none()
+    if shared_song is None:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="You have already shared song today.")
+    set_committed_value(shared_song, "track", track)
+
+    # 피드 인박스에 펼침
+    await fanout_share(db, shared_song)
+    await record_share(db, shared_song)  # 일별 차트 집계 반영
+    await db.commit()  # 비동기 커밋 (RETURNING으로 받은 값이 그대로 남으므로 refresh 불필요)
     return shared_song
 
+async def increment_reaction(db: AsyncSession, song_id: int) -> Optional[Tuple[int, int]]:
+    """
+    리액션 수를 DB에서 원자적으로 1 증가시키고 (증가 후 리액션 수, 공유자 ID)를 반환합니다.
+    곡이 없으면 None
+    """
+    result = await db.execute(
+        update(Song)
+        .where(Song.songId == song_id)
+        .values(reaction=Song.reaction + 1, reactedAt=datetime.utcnow())
+        .returning(Song.reaction, Song.sharedBy)
+    )
+    row = result.first()
+    await db.commit()
+    return (row.reaction, row.sharedBy) if row else None
+
+async def get_reaction_counts(db: AsyncSession, song_ids: List[int]) -> Dict[int, int]:
+    """
+    여러 곡의 리액션 수를 기본 키 조회 한 번으로 가져옵니다. 없는 곡은 결과에서 빠집니다.
+    """
+    if not song_ids:
+        return {}
+    result = await db.execute(select(Song.songId, Song.reaction).where(Song.songId.in_(set(song_ids))))
+    return {song_id: reaction for song_id, reaction in result.fetchall()}
+
 async def create_playlist(db: AsyncSession, playlist_create: PlaylistCreate, user_id: int):
     playlist_type = playlist_create.playlist_type
     try:
@@ -241,11 +263,15 @@ async def create_playlist(db: AsyncSession, playlist_create: PlaylistCreate, use
 # 마이플레이리스트에 노래 추가 함수
 async def add_song_to_playlist(db: AsyncSession, playlist_id: int, uri: str):
     try:
-        # 노래가 존재하는지 확인
+        # 노래가 존재하는지 확인 (tracks.uri 인덱스로 트랙을 찾고 가장 먼저 공유된 기록을 사용)
         song_result = await db.execute(
-            select(Song).filter(Song.uri == uri).order_by(Song.songId.asc())
+            select(Song.songId, Song.track_id)
+            .join(Track, Track.trackId == Song.track_id)
+            .where(Track.uri == uri)
+            .order_by(Song.songId.asc())
+            .limit(1)
         )
-        song = song_result.scalars().first()  # 첫 번째 결과를 가져옴
+        song = song_result.first()
         if not song:
             raise HTTPException(status_code=404, detail="Song not found")
         
@@ -255,15 +281,17 @@ async def add_song_to_playlist(db: AsyncSession, playlist_id: int, uri: str):
         if not playlist:
             raise HTTPException(status_code=404, detail="Playlist not found")
 
-        # 중복 여부 확인
+        # 중복 여부 확인 (같은 트랙의 다른 공유 기록이 이미 들어 있는 경우 포함)
         existing_entry = await db.execute(
             select(playlist_songs.c.song_id)
+            .join(Song, Song.songId == playlist_songs.c.song_id)
             .where(
                 playlist_songs.c.playlist_id == playlist_id,
-                playlist_songs.c.song_id == song.songId,
+                Song.track_id == song.track_id,
             )
+            .limit(1)
         )
-        if existing_entry.scalar_one_or_none():
+        if existing_entry.first():
             raise HTTPException(status_code=400, detail="Song already in the playlist")
 
         # 중간 테이블에 직접 추가
@@ -282,11 +310,9 @@ async def add_song_to_playlist(db: AsyncSession, playlist_id: int, uri: str):
 async def remove_song_from_playlist(db: AsyncSession, playlist_id: int, uri: str):
     try:
         # 노래가 존재하는지 확인
-        song_result = await db.execute(
-            select(Song).filter(Song.uri == uri).order_by(Song.songId.asc())
-        )
-        song = song_result.scalars().first()  # 첫 번째 결과를 가져옴
-        if not song:
+        track_result = await db.execute(select(Track.trackId).where(Track.uri == uri))
+        track_id = track_result.scalar_one_or_none()
+        if track_id is None:
             raise HTTPException(status_code=404, detail="Song not found")
         
         # 플레이리스트가 존재하는지 확인
@@ -298,7 +324,7 @@ async def remove_song_from_playlist(db: AsyncSession, playlist_id: int, uri: str
         # 노래가 존재하는지 확인 및 삭제
         delete_query = playlist_songs.delete().where(
             playlist_songs.c.playlist_id == playlist_id,
-            playlist_songs.c.song_id == song.songId,
+            playlist_songs.c.song_id.in_(select(Song.songId).where(Song.track_id == track_id)),
         )
         result = await db.execute(delete_query)
         if result.rowcount == 0:
@@ -312,36 +338,45 @@ async def remove_song_from_playlist(db: AsyncSession, playlist_id: int, uri: str
         logger.error(f"Error in remove_song_from_playlist: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+# 플레이리스트 트랙 응답에 필요한 컬럼 (SongInPlaylist 필드와 동일한 이름)
+PLAYLIST_TRACK_COLUMNS = (
+    Song.songId,
+    Track.title,
+    Track.artist,
+    Track.album,
+    Track.spotify_url,
+    Track.album_cover_url,
+    Track.uri,
+    Song.sharedBy,
+    Song.sharedAt,
+)
+
 # 특정 유형의 플레이리스트를 가져오는 함수
 async def get_playlist_by_type(user_id: int, playlist_type: str, db: AsyncSession) -> PlaylistResponse:
+    # ORM 엔티티 대신 필요한 컬럼만 Row 튜플로 조회
     result = await db.execute(
-        select(Playlist)
+        select(Playlist.playlistId, Playlist.name, Playlist.playlist_type, Playlist.createdAt)
         .where(Playlist.user_id == user_id, Playlist.playlist_type == playlist_type)
-        .options(selectinload(Playlist.songs))  # 플레이리스트와 노래 관계를 로드
+        .limit(1)
     )
-    playlist = result.scalars().first()
+    playlist = result.first()
 
     if not playlist:
         return None
 
+    tracks_result = await db.execute(
+        select(*PLAYLIST_TRACK_COLUMNS)
+        .select_from(Song)
+        .join(Track, Track.trackId == Song.track_id)
+        .join(playlist_songs, playlist_songs.c.song_id == Song.songId)
+        .where(playlist_songs.c.playlist_id == playlist.playlistId)
+    )
+
     # PlaylistResponse 스키마로 변환
     return PlaylistResponse(
         playlistId=playlist.playlistId,
         name=playlist.name,
         playlist_type=playlist.playlist_type,
         createdAt=playlist.createdAt,
-        tracks=[
-            {
-                "songId": song.songId,
-                "title": song.title,
-                "artist": song.artist,
-                "album": song.album,
-                "spotify_url": song.spotify_url,
-                "album_cover_url": song.album_cover_url,
-                "uri": song.uri,
-                "sharedBy": song.sharedBy,
-                "sharedAt": song.sharedAt,
-            }
-            for song in playlist.songs
-        ],
-    )
\ No newline at end of file
+        tracks=[row._asdict() for row in tracks_result],
+    )
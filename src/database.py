@@ -1,5 +1,6 @@
 # src/database.py
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -9,13 +10,16 @@ DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
 
 # Async engine 생성
 engine = create_async_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession)
+# 커밋 후에도 속성을 만료시키지 않음: 비동기 세션에서는 만료된 속성을 다시 읽을 수 없어 매번 refresh가 필요했음
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
 # initialize database
 async def init_db():
     # run_sync를 사용하여 동기 작업을 비동기 환경에서 실행
     async with engine.begin() as conn:
+        # 트라이그램 인덱스(gin_trgm_ops)를 만들려면 pg_trgm 확장이 먼저 있어야 함 (새 DB 대비)
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
 
 # get_db 함수 추가
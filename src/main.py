@@ -1,16 +1,20 @@
 # src/main.py
 
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from src.database import engine
 from src.models import Base
-from src.routers import playlists, spotify, songs, users, feed, auths, charts
+from src.routers import playlists, spotify, songs, users, feed, auths, charts, metrics
 from contextlib import asynccontextmanager
 from src.database import init_db
 from contextlib import asynccontextmanager
 import asyncio
 import platform
-from src.schedulers.scheduler import init_scheduler
+from src.schedulers.scheduler import init_scheduler, scheduler
+from src.services.reaction_buffer import reaction_buffer, REACTION_BUFFER_ENABLED
+from src.services.spotify_client import spotify_client, SpotifyUnavailableError
+from src.services.spotify_service import load_track_cache, save_track_cache
 
 if platform.system() == "Windows":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -19,10 +23,24 @@ if platform.system() == "Windows":
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db() # 앱 시작 시 데이터베이스 초기화
+    load_track_cache()
+    if REACTION_BUFFER_ENABLED:
+        reaction_buffer.start()
+    init_scheduler()  # lifespan을 쓰면 on_event("startup") 핸들러는 실행되지 않으므로 여기서 시작
     yield  # 종료 시에 수행할 추가 작업이 있다면 yield 이후에 추가 가능
+    scheduler.shutdown()
+    await reaction_buffer.stop()  # 아직 반영되지 않은 리액션을 마지막으로 flush
+    await spotify_client.aclose()  # Spotify keep-alive 연결 정리
+    save_track_cache()
 
 app = FastAPI(lifespan=lifespan)
 
+@app.exception_handler(SpotifyUnavailableError)
+async def spotify_unavailable_handler(request: Request, exc: SpotifyUnavailableError):
+    # 서킷 오픈/레이트 리밋/타임아웃 등 Spotify를 호출할 수 없을 때는 기다리지 않고 바로 503
+    headers = {"Retry-After": str(max(1, int(exc.retry_after)))} if exc.retry_after else None
+    return JSONResponse(status_code=503, content={"detail": exc.message}, headers=headers)
+
 # 각각의 라우터를 앱에 추가
 app.include_router(spotify.router, prefix="/spotify", tags=["Spotify"])
 app.include_router(songs.router, prefix="/songs", tags=["Songs"])
@@ -32,12 +50,8 @@ app.include_router(feed.router, prefix="/feed", tags=["Feed"])
 # app.include_router(notifications.router, prefix="/notifications", tags=["Notifications"])
 app.include_router(playlists.router, prefix="/playlists", tags=["Playlists"])
 app.include_router(charts.router, prefix="/charts", tags=["Charts"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
 
 @app.get("/")
 def read_root():
-    return {"message": "Welcome to Daily Jam!"}
-
-@app.on_event("startup")
-async def startup_event():
-    # 스케줄러 초기화
-    init_scheduler()
\ No newline at end of file
+    return {"message": "Welcome to Daily Jam!"}
\ No newline at end of file
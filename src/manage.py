@@ -0,0 +1,40 @@
+# src/manage.py
+# 운영용 유지보수 커맨드 모음
+# 사용법: python -m src.manage <command>
+
+import argparse
+import asyncio
+from src.database import SessionLocal
+from src.services.feed_service import rebuild_feed_inbox
+from src.services.chart_service import rebuild_share_rollup
+
+
+async def backfill_feed_inbox():
+    """ follows/songs 테이블로부터 피드 인박스(feed_items)를 다시 채웁니다. """
+    async with SessionLocal() as db:
+        inserted = await rebuild_feed_inbox(db)
+    print(f"Feed inbox rebuilt: {inserted} rows")
+
+
+async def rebuild_share_rollup_command():
+    """ songs 테이블로부터 일별 공유 집계(daily_track_shares)를 다시 계산합니다. """
+    async with SessionLocal() as db:
+        inserted = await rebuild_share_rollup(db)
+    print(f"Share rollup rebuilt: {inserted} rows")
+
+
+COMMANDS = {
+    "backfill-feed-inbox": backfill_feed_inbox,
+    "rebuild-share-rollup": rebuild_share_rollup_command,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MIML 백엔드 유지보수 커맨드")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args()
+    asyncio.run(COMMANDS[args.command]())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 # src/models.py
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Table, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date, Table, Boolean, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -12,7 +13,9 @@ chart_songs = Table(
     "chart_songs",
     Base.metadata,
     Column("chart_id", Integer, ForeignKey("charts.chartId"), primary_key=True),
-    Column("song_id", Integer, ForeignKey("songs.songId"), primary_key=True)
+    Column("song_id", Integer, ForeignKey("songs.songId"), primary_key=True),  # 같은 곡 공유 중 대표 songId
+    Column("rank", Integer, nullable=False),
+    Column("share_count", Integer, nullable=False)
 )
 
 # 중간 테이블 정의 (플레이리스트와 노래의 다대다 관계)
@@ -38,25 +41,67 @@ class User(Base):
     following = relationship("Follow", back_populates="following", foreign_keys='Follow.following_id')
     playlists = relationship("Playlist", back_populates="user")
 
+    __table_args__ = (
+        # 이름 검색용 트라이그램 인덱스 (ILIKE '%검색어%'와 similarity 정렬에 사용, pg_trgm 필요)
+        Index("ix_users_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
-class Song(Base):
-    __tablename__ = "songs"
 
-    songId = Column(Integer, primary_key=True, index=True)  # 변수명 변경: id -> songId
+class Track(Base):
+    __tablename__ = "tracks"
+
+    # Spotify URI 기준으로 한 번만 저장되는 곡 정보 (공유 기록은 trackId로 참조)
+    trackId = Column(Integer, primary_key=True, index=True)
+    uri = Column(String, unique=True, index=True, nullable=False)
     title = Column(String, nullable=False)
     artist = Column(String, nullable=False)
     album = Column(String, nullable=False)
     spotify_url = Column(String, nullable=False)
     album_cover_url = Column(String, nullable=True)
-    uri = Column(String, nullable=True)
+
+    songs = relationship("Song", back_populates="track")
+
+    __table_args__ = (
+        # 로컬 카탈로그 검색용 트라이그램 인덱스 (ILIKE '%검색어%'와 similarity 정렬에 사용, pg_trgm 필요)
+        Index("ix_tracks_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_tracks_artist_trgm", "artist", postgresql_using="gin", postgresql_ops={"artist": "gin_trgm_ops"}),
+    )
+
+
+class Song(Base):
+    __tablename__ = "songs"
+
+    # 공유 이벤트 한 건 (곡 정보는 tracks 테이블에 정규화)
+    songId = Column(Integer, primary_key=True, index=True)  # 변수명 변경: id -> songId
+    track_id = Column(Integer, ForeignKey("tracks.trackId"), nullable=False, index=True)
     sharedBy = Column(Integer, ForeignKey("users.userId"))  # 변수명 변경: shared_by -> sharedBy
     sharedAt = Column(DateTime, default=datetime.utcnow)  # 변수명 변경: shared_at -> sharedAt
     reaction = Column(Integer, default=0)  # 반응 수 기본값 0
+    reactedAt = Column(DateTime, nullable=True)  # 마지막 리액션 시각 (피드 델타 동기화용)
+    sharedDay = Column(Date, nullable=True)  # 공유한 날짜(UTC). 하루 한 번 공유 제한용, 공유가 아닌 행은 NULL
 
     user = relationship("User", back_populates="songs")
+    track = relationship("Track", back_populates="songs", lazy="joined")  # 비동기 세션에서 지연 로딩이 안 되므로 항상 함께 로드
     charts = relationship("Chart", secondary=chart_songs, back_populates="songs")
     playlists = relationship("Playlist", secondary=playlist_songs, back_populates="songs")
-    
+
+    __table_args__ = (
+        # 피드 키셋 페이지네이션용 복합 인덱스 (작성자별 공유 시각 순)
+        Index("ix_songs_sharedBy_sharedAt_songId", "sharedBy", "sharedAt", "songId"),
+        Index("ix_songs_sharedBy_reactedAt", "sharedBy", "reactedAt"),
+        Index("ix_songs_sharedAt", "sharedAt"),  # 차트 구간 조회용
+        # 하루에 한 번만 공유 가능 (DB가 동시 요청까지 보장)
+        UniqueConstraint("sharedBy", "sharedDay", name="uq_songs_sharedBy_sharedDay"),
+    )
+
+    # 기존 코드 호환용: song.title 등은 연결된 Track의 값을 읽음
+    title = association_proxy("track", "title")
+    artist = association_proxy("track", "artist")
+    album = association_proxy("track", "album")
+    spotify_url = association_proxy("track", "spotify_url")
+    album_cover_url = association_proxy("track", "album_cover_url")
+    uri = association_proxy("track", "uri")
+
     def to_dict(self):
         return {
             "songId": self.songId,
@@ -102,3 +147,31 @@ class Chart(Base):
     generatedAt = Column(DateTime, default=datetime.utcnow)  # 변수명 변경: generated_at -> generatedAt
 
     songs = relationship("Song", secondary=chart_songs, back_populates="charts")
+
+    __table_args__ = (
+        # 기간별 최신/과거 스냅샷 조회용
+        Index("ix_charts_chartType_generatedAt", "chartType", "generatedAt"),
+    )
+
+class FeedItem(Base):
+    __tablename__ = "feed_items"
+
+    # 공유 시점에 팔로워별로 미리 펼쳐 둔 피드 인박스 (fan-out-on-write)
+    user_id = Column(Integer, ForeignKey("users.userId"), primary_key=True)  # 피드 소유자
+    song_id = Column(Integer, ForeignKey("songs.songId"), primary_key=True)
+    sharedBy = Column(Integer, ForeignKey("users.userId"), nullable=False)
+    sharedAt = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_feed_items_user_id_sharedAt_song_id", "user_id", "sharedAt", "song_id"),
+        Index("ix_feed_items_user_id_sharedBy", "user_id", "sharedBy"),  # 언팔로우 시 삭제용
+    )
+
+class DailyTrackShare(Base):
+    __tablename__ = "daily_track_shares"
+
+    # 날짜별 곡 공유 횟수 집계. 차트는 원본 공유 대신 이 테이블을 합산
+    day = Column(Date, primary_key=True)  # sharedAt의 UTC 날짜
+    track_id = Column(Integer, ForeignKey("tracks.trackId"), primary_key=True)
+    song_id = Column(Integer, ForeignKey("songs.songId"), nullable=False)  # 그날 처음 공유된 대표 songId
+    share_count = Column(Integer, nullable=False, default=0)
@@ -5,10 +5,10 @@ from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from pydantic import BaseModel
-from src.crud import create_user
+from src.crud import create_user, normalize_name
 from src.models import Playlist, User
 from src.database import get_db
-from src.auth.security import get_password_hash, verify_password
+from src.auth.security import get_password_hash_async, verify_password_async
 from src.auth.auth import create_access_token
 from src.schemas import LoginResponse, RegisterRequest, LoginRequest
 from datetime import datetime, timedelta
@@ -18,6 +18,9 @@ router = APIRouter()
 
 @router.post("/register")
 async def register_user(request: RegisterRequest, db: AsyncSession = Depends(get_db)):
+    # bcrypt 해싱은 트랜잭션을 열기 전에 스레드 풀에서 실행 (이벤트 루프와 DB 커넥션을 붙잡지 않음)
+    hashed_pw = await get_password_hash_async(request.password)
+
     async with db.begin():  # 트랜잭션 관리
         # 이메일 중복 체크
         result = await db.execute(select(User).filter(User.email == request.email))
@@ -32,8 +35,8 @@ async def register_user(request: RegisterRequest, db: AsyncSession = Depends(get
         # 새로운 사용자 생성
         new_user = User(
             email=request.email,
-            hashed_pw=get_password_hash(request.password),
-            name=request.name,
+            hashed_pw=hashed_pw,
+            name=normalize_name(request.name),
             profile_image_url=profile_image_url,
         )
         db.add(new_user)
@@ -72,7 +75,7 @@ async def login_user(request: LoginRequest, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).filter(User.email == request.email))
     user = result.scalars().first()
     
-    if not user or not verify_password(request.password, user.hashed_pw):
+    if not user or not await verify_password_async(request.password, user.hashed_pw):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # 마이플레이리스트 조회
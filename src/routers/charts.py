@@ -1,30 +1,83 @@
 # app/routers/charts.py
 
-from fastapi import APIRouter, Depends
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database import get_db
-from src.crud import get_daily_chart, get_weekly_chart, get_monthly_chart, get_yearly_chart
-from src.schemas import ChartResponse  # 추가
-from typing import List
+from src.services.chart_service import (
+    get_chart, get_chart_snapshot, get_cached_period_chart, get_cached_charts,
+    CHART_PERIODS, ROLLING_PERIODS, DEFAULT_CHART_SIZE, MAX_CHART_SIZE,
+)
+from src.schemas import ChartResponse, ChartSnapshotResponse  # 추가
+from typing import Dict, List, Optional
 
 router = APIRouter()
 
 @router.get("/daily", response_model=List[ChartResponse])
-async def daily_chart(db: AsyncSession = Depends(get_db)):
-    chart = await get_daily_chart(db)
+async def daily_chart(limit: int = Query(DEFAULT_CHART_SIZE, ge=1, le=MAX_CHART_SIZE)):
+    chart = await get_cached_period_chart("daily", limit)
     return chart
 
 @router.get("/weekly", response_model=List[ChartResponse])
-async def weekly_chart(db: AsyncSession = Depends(get_db)):
-    chart = await get_weekly_chart(db)
+async def weekly_chart(limit: int = Query(DEFAULT_CHART_SIZE, ge=1, le=MAX_CHART_SIZE)):
+    chart = await get_cached_period_chart("weekly", limit)
     return chart
 
 @router.get("/monthly", response_model=List[ChartResponse])
-async def monthly_chart(db: AsyncSession = Depends(get_db)):
-    chart = await get_monthly_chart(db)
+async def monthly_chart(limit: int = Query(DEFAULT_CHART_SIZE, ge=1, le=MAX_CHART_SIZE)):
+    chart = await get_cached_period_chart("monthly", limit)
     return chart
 
 @router.get("/yearly", response_model=List[ChartResponse])
-async def monthly_chart(db: AsyncSession = Depends(get_db)):
-    chart = await get_yearly_chart(db)
-    return chart
\ No newline at end of file
+async def yearly_chart(limit: int = Query(DEFAULT_CHART_SIZE, ge=1, le=MAX_CHART_SIZE)):
+    chart = await get_cached_period_chart("yearly", limit)
+    return chart
+
+@router.get("/range", response_model=List[ChartResponse])
+async def range_chart(
+    start: datetime = Query(..., description="구간 시작 (UTC, 포함)"),
+    end: datetime = Query(..., description="구간 끝 (UTC, 미포함)"),
+    limit: int = Query(DEFAULT_CHART_SIZE, ge=1, le=MAX_CHART_SIZE),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    임의 구간 [start, end) 차트
+    """
+    # sharedAt은 naive UTC로 저장되므로 타임존이 붙은 입력은 UTC로 맞춤
+    start, end = (
+        value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+        for value in (start, end)
+    )
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be earlier than end")
+    return await get_chart(db, (start, end), limit)
+
+@router.get("/summary", response_model=Dict[str, List[ChartResponse]])
+async def chart_summary(
+    periods: List[str] = Query(list(CHART_PERIODS), description=f"{', '.join(CHART_PERIODS + tuple(ROLLING_PERIODS))} 중 선택"),
+    limit: int = Query(DEFAULT_CHART_SIZE, ge=1, le=MAX_CHART_SIZE),
+):
+    """
+    여러 기간의 차트를 한 번의 집계로 함께 반환 (롤링 24h/7d/30d 포함, 기간 조합별로 캐시)
+    """
+    return await get_cached_charts(periods, limit)
+
+@router.get("/history/{period}", response_model=ChartSnapshotResponse)
+async def chart_history(
+    period: str,
+    at: Optional[datetime] = Query(None, description="이 시각(UTC) 이전에 생성된 가장 최근 스냅샷. 없으면 최신"),
+    limit: int = Query(DEFAULT_CHART_SIZE, ge=1, le=MAX_CHART_SIZE),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    스케줄러가 저장한 과거 차트 스냅샷 조회
+    """
+    if period not in CHART_PERIODS:
+        raise HTTPException(status_code=400, detail=f"Unknown chart period: {period}")
+    if at is not None and at.tzinfo:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+
+    snapshot = await get_chart_snapshot(db, period, limit, at=at)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Chart snapshot not found")
+    return snapshot
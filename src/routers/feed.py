@@ -1,68 +1,45 @@
 # src/routers/feed.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import asc
 from src.database import get_db
-from src.models import User, Follow, Song
-from src.schemas import UserFeedResponse
-from typing import List
+from src.models import User
+from src.schemas import UserFeedPage
+from typing import Optional
 from src.auth.dependencies import get_current_user
+from src.services.feed_service import fetch_feed_page, fetch_feed_delta, stream_feed_ndjson, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter()
 
-@router.get("/{user_id}", response_model=List[UserFeedResponse])
+@router.get("/{user_id}", response_model=UserFeedPage)
 async def get_user_feed(
-    user_id: int, 
-    db: AsyncSession = Depends(get_db), 
+    user_id: int,
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor 또는 prev_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    direction: str = Query("next", pattern="^(next|prev)$"),
+    since: Optional[str] = Query(None, description="델타 동기화 워터마크 (이전 응답의 watermark)"),
+    stream: bool = Query(False, description="true면 피드 전체를 NDJSON으로 스트리밍"),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    사용자가 팔로우하는 유저들이 공유한 음악을 오래된 순서대로 조회하는 엔드포인트.
+    사용자가 팔로우하는 유저들이 공유한 음악을 페이지 단위로 조회하는 엔드포인트.
+    커서 없이 호출하면 가장 최근 페이지를 주고, prev_cursor로 더 오래된 페이지, next_cursor로 더 최근 페이지를 조회합니다.
+    (페이지 안의 항목은 오래된 순서)
+    since를 주면 그 이후의 새 항목과 리액션 변경분만 반환합니다. (델타 동기화)
+    stream=true면 페이지 없이 전체 피드를 한 줄에 한 항목씩(NDJSON) 스트리밍합니다.
     """
-    # 해당 유저가 팔로우하는 유저 ID 목록 가져오기
-    following_result = await db.execute(
-        select(Follow.following_id).where(Follow.follower_id == user_id)
-    )
-    following_ids = [row[0] for row in following_result.fetchall()]
+    if stream:
+        return StreamingResponse(stream_feed_ndjson(user_id), media_type="application/x-ndjson")
 
-    # 자신도 포함
-    following_ids.append(user_id)
-    following_ids = list(set(following_ids))  # 중복 제거
+    if since is not None:
+        return await fetch_feed_delta(db, user_id, since, limit=limit)
 
-    if not following_ids:
-        raise HTTPException(status_code=404, detail="No following users or shared songs found.")
+    page = await fetch_feed_page(db, user_id, cursor=cursor, limit=limit, direction=direction)
 
-    # 팔로우한 유저들이 공유한 노래를 한 번에 가져와 오래된 순서로 정렬
-    shared_songs_result = await db.execute(
-        select(Song, User)
-        .join(User, Song.sharedBy == User.userId)
-        .where(Song.sharedBy.in_(following_ids))
-        .order_by(asc(Song.sharedAt))  # 노래 공유 시간 기준으로 정렬
-    )
-    shared_songs = shared_songs_result.fetchall()
-
-    if not shared_songs:
+    # 커서 없이 조회했는데 비어 있으면 피드 자체가 없는 것
+    if not page["items"] and cursor is None:
         raise HTTPException(status_code=404, detail="No songs shared by following users.")
 
-    # 반환 데이터 구성
-    feed = []
-    for song, user in shared_songs:
-        feed.append({
-            "id": user.userId,
-            "name": user.name,
-            "profileImage": user.profile_image_url,
-            "Song": {  # 단일 객체로 반환
-                "songId": song.songId,  # songId 추가
-                "title": song.title,
-                "artist": song.artist,
-                "album_cover_url": song.album_cover_url,
-                "shared_at": song.sharedAt.isoformat(),  # ISO 포맷으로 변환
-                "reaction": song.reaction,
-                "spotify_url": song.spotify_url,
-                "uri": song.uri
-            }
-        })
-
-    return feed
\ No newline at end of file
+    return page
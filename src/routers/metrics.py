@@ -0,0 +1,41 @@
+# src/routers/metrics.py
+
+from fastapi import APIRouter
+from src.utils.cache import cache_stats
+from src.auth.security import password_hash_stats
+from src.services.reaction_buffer import reaction_buffer
+from src.services.spotify_client import spotify_client
+from src.services.spotify_service import track_loader
+
+router = APIRouter()
+
+@router.get("/caches")
+async def get_cache_metrics():
+    """
+    프로세스 내 캐시들의 크기와 적중률 (캐시 크기 조정용)
+    """
+    return cache_stats()
+
+
+@router.get("/reactions")
+async def get_reaction_buffer_metrics():
+    """
+    리액션 쓰기 지연 버퍼의 대기 중인 증가분과 flush 통계
+    """
+    return reaction_buffer.stats()
+
+
+@router.get("/spotify")
+async def get_spotify_metrics():
+    """
+    Spotify 업스트림 호출 수와 오류 수 (트랙 캐시 적중률은 /metrics/caches 참고)
+    """
+    return {**spotify_client.stats(), "track_loader": track_loader.stats()}
+
+
+@router.get("/auth")
+async def get_password_hash_metrics():
+    """
+    bcrypt 스레드 풀의 대기열 길이와 대기/실행 시간
+    """
+    return password_hash_stats()
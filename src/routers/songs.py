@@ -1,31 +1,68 @@
 # src/routers/songs.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from src.database import get_db
-from src.crud import share_song
-from src.services.spotify_service import get_song_details
-from src.schemas import SongShare,SongDetailResponse  # SongShare 스키마 추가 필요
+from src.crud import share_song, increment_reaction, get_reaction_counts
+from src.services.spotify_service import get_song_details, get_song_details_batch
+from src.schemas import SongShare,SongDetailResponse,SongDetailsBatchRequest,ShareSongResponse  # SongShare 스키마 추가 필요
 from src.auth.dependencies import get_current_user
+from src.services.feed_service import invalidate_feeds_of_author
+from src.services.profile_service import invalidate_profile_counts
+from src.services.reaction_buffer import reaction_buffer, REACTION_BUFFER_ENABLED
 from src.models import User,Song
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 from sqlalchemy.future import select
 from sqlalchemy.exc import NoResultFound
 
 router = APIRouter()
 
+# 리액션 수 일괄 조회 시 한 번에 받을 수 있는 최대 songId 수
+MAX_REACTION_BATCH = 300
+# 상세 정보 일괄 조회 시 한 번에 받을 수 있는 최대 URI 수
+MAX_DETAILS_BATCH = 100
+
+# /{song_uri}보다 먼저 등록해야 "reactions"가 곡 URI로 해석되지 않음
+@router.get("/reactions")
+async def get_reactions_batch(
+    ids: List[int] = Query(..., description="리액션 수를 조회할 songId 목록 (ids=1&ids=2...)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+    ):
+    """
+    화면에 보이는 여러 곡의 리액션 수를 한 번에 조회하는 엔드포인트.
+    존재하지 않는 songId는 결과에서 빠집니다.
+    """
+    if len(ids) > MAX_REACTION_BATCH:
+        raise HTTPException(status_code=400, detail=f"Too many song ids (max {MAX_REACTION_BATCH})")
+
+    counts = await get_reaction_counts(db, ids)
+    return {
+        "reactions": {song_id: reaction + reaction_buffer.pending(song_id) for song_id, reaction in counts.items()}
+    }
+
+@router.post("/details", response_model=Dict[str, Optional[SongDetailResponse]])
+async def get_song_details_bulk(request: SongDetailsBatchRequest):
+    """
+    여러 노래의 상세 정보를 한 번에 반환하는 엔드포인트. 찾을 수 없는 URI는 null
+    """
+    if len(request.uris) > MAX_DETAILS_BATCH:
+        raise HTTPException(status_code=400, detail=f"Too many uris (max {MAX_DETAILS_BATCH})")
+    return await get_song_details_batch(request.uris)
+
 @router.get("/{song_uri}", response_model=SongDetailResponse)
-def get_song_detail(song_uri: str):
+async def get_song_detail(song_uri: str):
     """
     선택된 노래의 상세 정보를 반환하는 엔드포인트.
     """
-    song_detail = get_song_details(song_uri)
+    song_detail = await get_song_details(song_uri)
     if not song_detail:
         raise HTTPException(status_code=404, detail="Song details not found")
     return song_detail
 
 
-@router.post("/{song_uri}/share")
+@router.post("/{song_uri}/share", response_model=ShareSongResponse)
 async def share_song_to_feed(
     song: SongShare, 
     db: Session = Depends(get_db),
@@ -34,23 +71,7 @@ async def share_song_to_feed(
     """
     사용자가 노래를 선택하여 피드에 공유하는 엔드포인트
     """
-    # 현재 날짜를 가져옵니다.
-    today = datetime.utcnow().date()
-
-    stmt = select(Song).where(
-        Song.sharedBy == current_user.userId,
-        Song.sharedAt >= today
-    )
-
-    result = await db.execute(stmt)
-    existing_share = result.scalars().first()
-    
-    if existing_share:
-        raise HTTPException(
-            status_code=400, 
-            detail="You have already shared song today."
-        )
-
+    # 하루 한 번 공유 제한은 share_song의 INSERT ... ON CONFLICT에서 처리 (이미 공유했으면 400)
     # 공유 로직 실행
     shared_song = await share_song(
         db=db,
@@ -65,6 +86,10 @@ async def share_song_to_feed(
     
     if not shared_song:
         raise HTTPException(status_code=400, detail="Failed to share song.")
+
+    # 공유자와 팔로워들의 피드 캐시 무효화
+    await invalidate_feeds_of_author(db, current_user.userId)
+    invalidate_profile_counts(current_user.userId)
     
     return {"message": "Song shared successfully", "shared_song": shared_song}
 
@@ -76,26 +101,25 @@ async def add_reaction(
     current_user: User = Depends(get_current_user)
     ):
     
-    # 노래 존재 여부 확인
-    result = await db.execute(select(Song).filter(Song.songId == song_id))
-    song = result.scalars().first()
-    
-    if not song:
-        raise HTTPException(status_code=404, detail="Song not found")
+    if REACTION_BUFFER_ENABLED:
+        # 증가분은 버퍼에 모았다가 주기적으로 한 번에 반영 (피드 캐시 무효화도 flush 시점에 수행)
+        result = await db.execute(select(Song.reaction).where(Song.songId == song_id))
+        stored = result.scalar_one_or_none()
+        if stored is None:
+            raise HTTPException(status_code=404, detail="Song not found")
+        reaction_buffer.add(song_id)
+        return {"message": "Reaction added successfully", "songId": song_id, "reactions": stored + reaction_buffer.pending(song_id)}
 
-    # 리액션 수 증가
-    song.reaction += 1
-    
-    # 세션에 변경 사항 반영
-    db.add(song)  # 변경된 객체를 세션에 추가
-
-    # 데이터베이스 커밋
-    await db.commit()
+    # 조회 없이 한 번의 UPDATE ... RETURNING으로 증가 (동시 요청에도 증가분이 유실되지 않음)
+    updated = await increment_reaction(db, song_id)
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Song not found")
+    reactions, shared_by = updated
 
-    # 변경된 데이터를 다시 로드하여 반영
-    await db.refresh(song)
+    # 이 노래가 노출되는 피드 캐시 무효화
+    await invalidate_feeds_of_author(db, shared_by)
 
-    return {"message": "Reaction added successfully", "songId": song.songId, "reactions": song.reaction}
+    return {"message": "Reaction added successfully", "songId": song_id, "reactions": reactions}
 
 # 노래의 리액션 수 조회 기능 엔드포인트
 @router.get("/{song_id}/reactions")
@@ -105,11 +129,11 @@ async def get_reactions(
     current_user: User = Depends(get_current_user)
     ):
     
-    # 노래 존재 여부 확인
-    result = await db.execute(select(Song).filter(Song.songId == song_id))
-    song = result.scalars().first()
+    # 노래 존재 여부 확인 (리액션 수 컬럼만 조회)
+    result = await db.execute(select(Song.reaction).where(Song.songId == song_id))
+    reaction = result.scalar_one_or_none()
     
-    if not song:
+    if reaction is None:
         raise HTTPException(status_code=404, detail="Song not found")
 
-    return {"songId": song.songId, "reactions": song.reaction}
\ No newline at end of file
+    return {"songId": song_id, "reactions": reaction + reaction_buffer.pending(song_id)}
\ No newline at end of file
@@ -1,7 +1,7 @@
 # src/routers/spotify.py
 from fastapi import APIRouter, HTTPException, Query, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.services.spotify_service import get_song_info, get_song_details
+from src.services.spotify_service import search_songs, get_song_details, SEARCH_WINDOW_SIZE
 from src.database import get_db
 from src.crud import share_song
 from src.schemas import SongShare, SongDetailResponse
@@ -10,11 +10,17 @@ from src.models import User
 router = APIRouter()
 
 @router.get("/search")
-def search_song(song_name: str = Query(..., description="Name of the song to search")):
+async def search_song(
+    song_name: str = Query(..., description="Name of the song to search"),
+    offset: int = Query(0, ge=0, lt=SEARCH_WINDOW_SIZE),
+    limit: int = Query(SEARCH_WINDOW_SIZE, ge=1, le=SEARCH_WINDOW_SIZE),
+    db: AsyncSession = Depends(get_db),
+):
     """
-    노래를 검색하기 위한 엔드포인트. 검색된 모든 노래의 목록을 반환합니다.
+    노래를 검색하기 위한 엔드포인트. 검색된 노래 목록을 offset부터 limit개 반환합니다.
+    이미 공유/검색된 적 있는 곡은 로컬 카탈로그에서 바로 응답합니다.
     """
-    songs = get_song_info(song_name)
+    songs = await search_songs(db, song_name, offset, limit)
     if not songs:
         raise HTTPException(status_code=404, detail="No songs found with the given name")
     return {"songs": songs}
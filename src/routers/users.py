@@ -1,14 +1,17 @@
 # src/routers/users.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from src.database import get_db
-from src.schemas import UserCreate, UserResponse, FollowRequest, SongResponse, UserUpdate
+from src.schemas import UserCreate, UserResponse, UserSearchPage, FollowRequest, SongResponse, UserUpdate
 from src.models import User, Follow, Song
 from src.crud import create_user, get_user_by_email, search_user_by_name, add_follow, update_user_profile
-from typing import List
-from src.auth.dependencies import get_current_user
+from typing import List, Optional
+from src.auth.dependencies import get_current_user, invalidate_principal_cache
+from src.services.feed_service import fanout_unfollow, invalidate_feed_cache, invalidate_feeds_of_author, stream_share_history_ndjson
+from src.services.profile_service import get_profile, invalidate_profile_counts
 
 router = APIRouter()
 
@@ -18,43 +21,15 @@ async def get_user_profile(
     db: AsyncSession = Depends(get_db), 
     current_user: User = Depends(get_current_user)
 ):
-    user_result = await db.execute(select(User).where(User.userId == user_id))
-    user = user_result.scalars().first()
-    
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    """
+    프로필 화면 정보 (사용자, 팔로우 여부, 최근 공유곡, 팔로워/팔로잉/공유 수)를 한 번의 쿼리로 반환
+    """
+    profile = await get_profile(db, user_id, current_user.userId)
 
-    follow_status_result = await db.execute(
-        select(Follow).where(
-            Follow.follower_id == current_user.userId,
-            Follow.following_id == user_id
-        )
-    )
-    is_following = follow_status_result.scalar() is not None
+    if profile is None:
+        raise HTTPException(status_code=404, detail="User not found")
 
-    shared_song_result = await db.execute(
-        select(Song).where(Song.sharedBy == user_id).order_by(Song.sharedAt.desc()).limit(1)
-    )
-    shared_song = shared_song_result.scalars().first()
-
-    return {
-        "user": {
-            "email": user.email,
-            "name": user.name,
-            "profile_image_url": user.profile_image_url,
-            "createdAt": user.createdAt,
-            "userId": user.userId
-        },
-        "is_following": is_following,
-        "recent_shared_song": {
-            "title": shared_song.title if shared_song else None,
-            "artist": shared_song.artist if shared_song else None,
-            "album": shared_song.album if shared_song else None,
-            "spotify_url": shared_song.spotify_url if shared_song else None,
-            "sharedAt": shared_song.sharedAt if shared_song else None,
-            "album_cover_url": shared_song.album_cover_url if shared_song else None
-        } if shared_song else None
-    }
+    return profile
 
 @router.put("/profile/{user_id}")
 async def update_user_profile_endpoint(
@@ -71,6 +46,13 @@ async def update_user_profile_endpoint(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    # 이메일(토큰의 sub)이나 비밀번호가 바뀌면 캐시된 인증 정보로 기존 토큰이 계속 통과하지 않도록 무효화
+    if user_update.email or user_update.password:
+        invalidate_principal_cache(user_id)
+    # 피드 페이지에 공유자 이름과 프로필 이미지가 들어 있으므로 본인과 팔로워들의 피드 캐시도 무효화
+    if user_update.name or user_update.profile_image_url:
+        await invalidate_feeds_of_author(db, user_id)
+
     return {"message": "Profile updated successfully", "user": user}
 
 @router.get("/profile/{user_id}/following", response_model=List[UserResponse])
@@ -97,21 +79,36 @@ async def get_followers_list(user_id: int, db: AsyncSession = Depends(get_db), c
 
     return followers
 
-@router.get("/search", response_model=List[UserResponse])
-async def search_user(name: str, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    users_result = await db.execute(
-        select(User)
-        .filter(
-            User.name.ilike(f"%{name}%"),  # 이름으로 검색
-            User.userId != current_user.userId  # 본인은 제외
-        )
+@router.get("/search", response_model=UserSearchPage)
+async def search_user(
+    name: str,
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    이름으로 사용자 검색 (본인 제외). 일치도가 높은 순으로 limit명씩 반환합니다.
+    """
+    users, next_cursor = await search_user_by_name(
+        db, name, limit=limit, cursor=cursor, exclude_user_id=current_user.userId
     )
-    users = users_result.scalars().all()
 
-    if not users:
+    if not users and cursor is None:
         raise HTTPException(status_code=404, detail="No users found with the given name")
 
-    return users
+    return {"items": users, "next_cursor": next_cursor}
+
+@router.get("/{user_id}/shares/export")
+async def export_share_history(user_id: int, current_user: User = Depends(get_current_user)):
+    """
+    사용자의 공유 기록 전체를 NDJSON으로 내보내는 엔드포인트
+    """
+    return StreamingResponse(
+        stream_share_history_ndjson(user_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="shares_{user_id}.ndjson"'},
+    )
 
 @router.post("/{user_id}/follow")
 async def follow_user(
@@ -124,6 +121,8 @@ async def follow_user(
         raise HTTPException(status_code=400, detail="You cannot follow yourself.")
     
     follow = await add_follow(db, follower_id=current_user.userId, following_id=user_id)
+    invalidate_feed_cache(current_user.userId)
+    invalidate_profile_counts(current_user.userId, user_id)
     
     return {"message": "Followed successfully", "follow": follow}
 
@@ -154,6 +153,9 @@ async def unfollow_user(
     
     # 팔로우 관계 삭제
     await db.delete(follow)
+    await fanout_unfollow(db, current_user.userId, user_id)  # 피드 인박스에서 제거
     await db.commit()
+    invalidate_feed_cache(current_user.userId)
+    invalidate_profile_counts(current_user.userId, user_id)
     
     return {"message": "Unfollowed successfully"}
\ No newline at end of file
@@ -1,10 +1,15 @@
+from datetime import datetime
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from src.database import get_db
 from fastapi import Depends
-from src.schedulers.tasks import recreate_daily_playlist
+from src.schedulers.tasks import recreate_daily_playlist, generate_chart_snapshots_job
+from src.config.config import load_config
 from pytz import timezone
 
+config = load_config()
+
 scheduler = AsyncIOScheduler()
 
 def init_scheduler():
@@ -17,3 +22,14 @@ def init_scheduler():
         id="recreate_daily_playlist_job",
         replace_existing=True,
     )
+
+    # 차트 스냅샷 생성 (앱 시작 시 한 번, 이후 일정 간격으로)
+    scheduler.add_job(
+        func=generate_chart_snapshots_job,
+        trigger=IntervalTrigger(minutes=config["CHART_SNAPSHOT_INTERVAL_MINUTES"]),
+        next_run_time=datetime.now(),
+        id="generate_chart_snapshots_job",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
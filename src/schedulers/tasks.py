@@ -4,9 +4,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.sql import delete
 from datetime import datetime, timedelta
-from src.database import get_db
+from src.database import get_db, SessionLocal
 from src.models import User, Song, Playlist, Follow, playlist_songs
+from src.services.chart_service import generate_chart_snapshots, prune_chart_snapshots
 from pytz import timezone
+import logging
+
+logger = logging.getLogger(__name__)
 
 async def recreate_daily_playlist(
     db: AsyncSession = Depends(get_db), 
@@ -77,19 +81,18 @@ async def recreate_daily_playlist(
 
                 # 최근 24시간 내 공유된 노래 조회
                 shared_songs_result = await db.execute(
-                    select(Song).where(
+                    select(Song.songId, Song.track_id).where(
                         Song.sharedAt >= today_start_utc_naive,  # Use naive datetime for comparison
                         Song.sharedBy.in_([user.userId] + followed_user_ids)
-                    )
+                    ).order_by(Song.songId)
                 )
-                shared_songs = shared_songs_result.scalars().all()
+                shared_songs = shared_songs_result.fetchall()
                 
-                # 중복 제거: 제목과 가수를 기준으로
+                # 중복 제거: 같은 트랙(track_id)은 가장 먼저 공유된 기록 하나만 사용
                 unique_songs = {}
                 for song in shared_songs:
-                    key = (song.title.strip().lower(), song.artist.strip().lower())  # 대소문자 및 공백 제거
-                    if key not in unique_songs:
-                        unique_songs[key] = song
+                    if song.track_id not in unique_songs:
+                        unique_songs[song.track_id] = song
 
                 # 기존 플레이리스트의 노래 삭제
                 await db.execute(
@@ -125,4 +128,16 @@ async def recreate_daily_playlist(
     except Exception as e:
         print(f"Error in recreate_daily_playlist: {str(e)}")
         if is_test:
-            raise  # 테스트 시 예외를 바로 반환
\ No newline at end of file
+            raise  # 테스트 시 예외를 바로 반환
+
+async def generate_chart_snapshots_job():
+    """
+    차트 스냅샷을 생성하는 스케줄러 작업. 요청 세션이 없으므로 세션을 직접 엽니다.
+    """
+    try:
+        async with SessionLocal() as db:
+            chart_ids = await generate_chart_snapshots(db)
+            pruned = await prune_chart_snapshots(db)
+        logger.info(f"Generated chart snapshots: {chart_ids}, pruned {pruned} old snapshots")
+    except Exception as e:
+        logger.error(f"Error in generate_chart_snapshots_job: {str(e)}")
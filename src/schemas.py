@@ -1,7 +1,7 @@
 # src/schemas.py
 
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
 
 class SongBase(BaseModel):
@@ -47,6 +47,38 @@ class SongDetailResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+class SharedSong(BaseModel):
+    """
+    공유된 노래 한 건 (곡 정보는 tracks 테이블에서 오지만 응답에서는 평평한 필드로 유지)
+    """
+    songId: int
+    title: str
+    artist: str
+    album: str
+    spotify_url: str
+    album_cover_url: Optional[str] = None
+    uri: str
+    sharedBy: int
+    sharedAt: datetime
+    reaction: Optional[int] = 0
+
+    class Config:
+        orm_mode = True
+
+class ShareSongResponse(BaseModel):
+    """
+    노래 공유 엔드포인트 응답 스키마
+    """
+    message: str
+    shared_song: SharedSong
+
+class SongDetailsBatchRequest(BaseModel):
+    """
+    여러 노래의 상세 정보를 한 번에 조회할 때 사용하는 스키마
+    """
+    uris: List[str]
+
 class UserBase(BaseModel):
     """
     사용자 기본 정보를 담는 스키마
@@ -71,6 +103,13 @@ class UserResponse(UserBase):
     class Config:
         orm_mode = True  # ORM 모델을 기반으로 직렬화 가능하도록 설정
 
+class UserSearchPage(BaseModel):
+    """
+    사용자 검색 결과 페이지 (점수 순, 키셋 페이지네이션)
+    """
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None  # 다음 페이지를 가져올 커서
+
 class UserUpdate(BaseModel):
     email: Optional[str]
     password: Optional[str]
@@ -107,6 +146,16 @@ class UserFeedResponse(BaseModel):
     class Config:
         orm_mode = True
 
+class UserFeedPage(BaseModel):
+    """
+    키셋 페이지네이션이 적용된 피드 응답 스키마
+    """
+    items: List[UserFeedResponse]
+    next_cursor: Optional[str] = None  # 더 최근 항목을 가져올 커서
+    prev_cursor: Optional[str] = None  # 더 오래된 항목을 가져올 커서
+    watermark: Optional[str] = None  # 델타 동기화: 다음 요청의 since 값
+    reactions: Optional[List[Tuple[int, int]]] = None  # 델타 동기화: (songId, reaction) 변경분
+
 
 class FollowerInfo(BaseModel):
     userId: int
@@ -150,6 +199,15 @@ class ChartResponse(BaseModel):
     album_cover_url: Optional[str]  # 앨범 커버 URL 필드 추가
     share_count: int
 
+class ChartSnapshotResponse(BaseModel):
+    """
+    저장된 차트 스냅샷 응답 스키마
+    """
+    chartId: int
+    chartType: str
+    generatedAt: datetime
+    entries: List[ChartResponse]
+
 class RegisterRequest(BaseModel):
     email: str
     password: str
@@ -0,0 +1,383 @@
+# src/services/chart_service.py
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import func, and_, or_, insert, delete, cast, Date
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from src.models import Song, Track, Chart, chart_songs, DailyTrackShare
+from src.database import SessionLocal
+from src.config.config import load_config
+from src.utils.cache import TTLCache
+
+config = load_config()
+
+# 기간 이름 -> 차트 구간. 고정 기간(daily 등)은 달력 기준, 나머지는 현재 시각 기준 롤링 구간
+CHART_PERIODS = ("daily", "weekly", "monthly", "yearly")
+ROLLING_PERIODS = {"24h": timedelta(hours=24), "7d": timedelta(days=7), "30d": timedelta(days=30)}
+
+DEFAULT_CHART_SIZE = 50
+MAX_CHART_SIZE = 200
+
+# 차트 항목에 표시할 곡 정보 (집계는 정수 키 track_id로 하고 마지막에 tracks와 조인)
+CHART_TRACK_COLUMNS = (Track.title, Track.artist, Track.uri, Track.album_cover_url)
+
+# 기간별 차트(상위 MAX_CHART_SIZE곡)를 캐시하고 요청 limit만큼 잘라서 응답
+chart_cache = TTLCache(
+    "charts",
+    maxsize=len(CHART_PERIODS),
+    ttl=config["CHART_CACHE_TTL_SECONDS"],
+    serve_stale=config["CHART_CACHE_SERVE_STALE"],
+)
+
+# /charts/summary 응답 캐시: 요청한 기간 조합 -> 기간별 상위 MAX_CHART_SIZE곡
+chart_summary_cache = TTLCache(
+    "chart_summary",
+    maxsize=64,
+    ttl=config["CHART_CACHE_TTL_SECONDS"],
+    serve_stale=config["CHART_CACHE_SERVE_STALE"],
+)
+
+Window = Tuple[datetime, datetime]
+
+
+def chart_window(period: str, now: Optional[datetime] = None) -> Window:
+    """
+    기간 이름을 [start, end) 반열린 UTC 구간으로 변환합니다.
+    """
+    now = now or datetime.utcnow()
+    if period in ROLLING_PERIODS:
+        return now - ROLLING_PERIODS[period], now
+
+    today = datetime(now.year, now.month, now.day)
+    if period == "daily":
+        return today, today + timedelta(days=1)
+    if period == "weekly":
+        start = today - timedelta(days=today.weekday())
+        return start, start + timedelta(days=7)
+    if period == "monthly":
+        start = today.replace(day=1)
+        end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+        return start, end
+    if period == "yearly":
+        start = today.replace(month=1, day=1)
+        return start, start.replace(year=start.year + 1)
+
+    raise HTTPException(status_code=400, detail=f"Unknown chart period: {period}")
+
+
+def _in_window(window: Window):
+    # sharedAt에 함수를 씌우지 않아야 ix_songs_sharedAt 인덱스를 탈 수 있음
+    start, end = window
+    return and_(Song.sharedAt >= start, Song.sharedAt < end)
+
+
+# 같은 곡으로 묶인 공유 중 가장 먼저 공유된 songId (스냅샷 저장용 대표 ID)
+REPRESENTATIVE_SONG_ID = func.min(Song.songId).label("song_id")
+
+
+def _chart_entry(rank: int, row, share_count: int) -> dict:
+    return {
+        "rank": rank,
+        "song_id": row.song_id,
+        "title": row.title,
+        "artist": row.artist,
+        "uri": row.uri,
+        "album_cover_url": row.album_cover_url,
+        "share_count": share_count,
+    }
+
+
+def _is_day_aligned(window: Window) -> bool:
+    return all(value == datetime(value.year, value.month, value.day) for value in window)
+
+
+def _in_day_window(window: Window):
+    start, end = window
+    return and_(DailyTrackShare.day >= start.date(), DailyTrackShare.day < end.date())
+
+
+def _chart_totals(windows: List[Window]):
+    """
+    구간별 공유 횟수(count_0, count_1, ...)를 트랙 단위로 집계하는 서브쿼리.
+    모든 구간이 날짜 경계에 맞으면 daily_track_shares 집계 테이블을 합산하고(트랙당 최대 며칠 치 행),
+    롤링 구간처럼 경계가 안 맞으면 songs 원본을 sharedAt 범위로 스캔합니다.
+    """
+    outer = (min(start for start, _ in windows), max(end for _, end in windows))
+
+    if all(_is_day_aligned(window) for window in windows):
+        counts = [
+            func.coalesce(func.sum(DailyTrackShare.share_count).filter(_in_day_window(window)), 0).label(f"count_{idx}")
+            for idx, window in enumerate(windows)
+        ]
+        return (
+            select(DailyTrackShare.track_id, func.min(DailyTrackShare.song_id).label("song_id"), *counts)
+            .where(_in_day_window(outer))
+            .group_by(DailyTrackShare.track_id)
+            .subquery()
+        )
+
+    counts = [
+        func.count(Song.songId).filter(_in_window(window)).label(f"count_{idx}")
+        for idx, window in enumerate(windows)
+    ]
+    return (
+        select(Song.track_id, REPRESENTATIVE_SONG_ID, *counts)
+        .where(_in_window(outer))
+        .group_by(Song.track_id)
+        .subquery()
+    )
+
+
+def _chart_query(windows: List[Window]):
+    totals = _chart_totals(windows)
+    return select(
+        *CHART_TRACK_COLUMNS,
+        totals.c.track_id,
+        totals.c.song_id,
+        *[totals.c[f"count_{idx}"] for idx in range(len(windows))],
+    ).join(Track, Track.trackId == totals.c.track_id)
+
+
+async def get_chart(db: AsyncSession, window: Window, limit: int = DEFAULT_CHART_SIZE) -> List[dict]:
+    """
+    구간 안에서 공유된 노래의 공유 횟수를 집계하고 상위 limit개에 순위를 부여합니다.
+    """
+    stmt = _chart_query([window])
+    share_count = stmt.selected_columns.count_0
+    result = await db.execute(stmt.order_by(share_count.desc(), stmt.selected_columns.track_id).limit(limit))
+    return [_chart_entry(idx + 1, row, row.count_0) for idx, row in enumerate(result)]
+
+
+async def get_charts(db: AsyncSession, windows: Dict[str, Window], limit: int = DEFAULT_CHART_SIZE) -> Dict[str, List[dict]]:
+    """
+    여러 구간의 차트를 한 번의 스캔으로 계산합니다.
+    가장 넓은 범위만 읽고, 구간별 공유 횟수는 FILTER 집계로 따로 센 뒤
+    구간별 순위(row_number)도 DB에서 매겨 어느 구간에서든 상위 limit 안에 드는 트랙만 가져옵니다.
+    """
+    if not windows:
+        return {}
+
+    names = list(windows)
+    totals = _chart_totals([windows[name] for name in names])
+    count_columns = [totals.c[f"count_{idx}"] for idx in range(len(names))]
+    ranked = select(
+        *totals.c,
+        *[
+            func.row_number().over(order_by=(column.desc(), totals.c.track_id)).label(f"rank_{idx}")
+            for idx, column in enumerate(count_columns)
+        ],
+    ).subquery()
+
+    result = await db.execute(
+        select(
+            *CHART_TRACK_COLUMNS,
+            ranked.c.song_id,
+            *[ranked.c[f"count_{idx}"] for idx in range(len(names))],
+            *[ranked.c[f"rank_{idx}"] for idx in range(len(names))],
+        )
+        .join(Track, Track.trackId == ranked.c.track_id)
+        .where(or_(*[
+            and_(ranked.c[f"rank_{idx}"] <= limit, ranked.c[f"count_{idx}"] > 0)
+            for idx in range(len(names))
+        ]))
+    )
+    rows = result.fetchall()
+
+    charts = {}
+    for idx, name in enumerate(names):
+        count, rank = f"count_{idx}", f"rank_{idx}"
+        ranked_rows = sorted(
+            (row for row in rows if row._mapping[count] and row._mapping[rank] <= limit),
+            key=lambda row: row._mapping[rank],
+        )
+        charts[name] = [_chart_entry(row._mapping[rank], row, row._mapping[count]) for row in ranked_rows]
+    return charts
+
+
+async def get_cached_charts(periods: List[str], limit: int = DEFAULT_CHART_SIZE) -> Dict[str, List[dict]]:
+    """
+    여러 기간의 차트를 TTL 캐시에서 응답합니다. (기간 조합마다 상위 MAX_CHART_SIZE곡을 캐시하고 limit만큼 잘라 씀)
+    """
+    periods = list(dict.fromkeys(periods))
+    for period in periods:
+        if period not in CHART_PERIODS and period not in ROLLING_PERIODS:
+            raise HTTPException(status_code=400, detail=f"Unknown chart period: {period}")
+
+    async def load() -> Dict[str, List[dict]]:
+        now = datetime.utcnow()
+        async with SessionLocal() as db:
+            return await get_charts(db, {period: chart_window(period, now) for period in periods}, MAX_CHART_SIZE)
+
+    charts = await chart_summary_cache.get_or_load(tuple(periods), load)
+    return {period: entries[:limit] for period, entries in charts.items()}
+
+
+async def get_period_chart(db: AsyncSession, period: str, limit: int = DEFAULT_CHART_SIZE) -> List[dict]:
+    return await get_chart(db, chart_window(period), limit)
+
+
+async def generate_chart_snapshots(db: AsyncSession, periods=CHART_PERIODS) -> Dict[str, int]:
+    """
+    기간별 차트를 한 번에 계산해 charts/chart_songs 테이블에 순위와 공유 횟수와 함께 저장합니다.
+    스냅샷에는 상위 MAX_CHART_SIZE곡까지 저장되므로 조회 시 어떤 limit이든 그대로 잘라 쓸 수 있습니다.
+    """
+    now = datetime.utcnow()
+    charts = await get_charts(db, {period: chart_window(period, now) for period in periods}, MAX_CHART_SIZE)
+
+    chart_ids = {}
+    for period, entries in charts.items():
+        chart = Chart(chartType=period, generatedAt=now)
+        db.add(chart)
+        await db.flush()  # chartId 생성
+        if entries:
+            await db.execute(
+                insert(chart_songs),
+                [
+                    {
+                        "chart_id": chart.chartId,
+                        "song_id": entry["song_id"],
+                        "rank": entry["rank"],
+                        "share_count": entry["share_count"],
+                    }
+                    for entry in entries
+                ],
+            )
+        chart_ids[period] = chart.chartId
+
+    await db.commit()
+    chart_cache.clear()  # 새 스냅샷을 다음 요청부터 바로 응답
+    return chart_ids
+
+
+async def prune_chart_snapshots(db: AsyncSession, retention: Optional[timedelta] = None) -> int:
+    """
+    retention보다 오래된 스냅샷은 기간별로 하루에 마지막 하나만 남기고 삭제합니다.
+    (최근 구간은 스케줄 간격 그대로 조회할 수 있고, 과거 기록은 날짜 단위로 유지) 삭제한 스냅샷 수를 반환
+    """
+    if retention is None:
+        retention = timedelta(hours=config["CHART_SNAPSHOT_RETENTION_HOURS"])
+    cutoff = datetime.utcnow() - retention
+
+    ranked = (
+        select(
+            Chart.chartId,
+            func.row_number().over(
+                partition_by=(Chart.chartType, cast(Chart.generatedAt, Date)),
+                order_by=(Chart.generatedAt.desc(), Chart.chartId.desc()),
+            ).label("day_rank"),
+        )
+        .where(Chart.generatedAt < cutoff)
+        .subquery()
+    )
+    stale_ids = select(ranked.c.chartId).where(ranked.c.day_rank > 1)
+
+    await db.execute(delete(chart_songs).where(chart_songs.c.chart_id.in_(stale_ids)))
+    result = await db.execute(delete(Chart).where(Chart.chartId.in_(stale_ids)))
+    await db.commit()
+    return result.rowcount
+
+
+async def get_chart_snapshot(
+    db: AsyncSession,
+    period: str,
+    limit: int = DEFAULT_CHART_SIZE,
+    at: Optional[datetime] = None,
+) -> Optional[dict]:
+    """
+    period의 가장 최근 스냅샷(at이 있으면 at 시점 이전의 가장 최근 스냅샷)을 한 번의 쿼리로 읽습니다.
+    스냅샷이 없으면 None
+    """
+    latest_chart = select(Chart.chartId, Chart.generatedAt).where(Chart.chartType == period)
+    if at is not None:
+        latest_chart = latest_chart.where(Chart.generatedAt <= at)
+    latest_chart = latest_chart.order_by(Chart.generatedAt.desc()).limit(1).subquery()
+
+    result = await db.execute(
+        select(
+            latest_chart.c.chartId,
+            latest_chart.c.generatedAt,
+            chart_songs.c.rank,
+            chart_songs.c.share_count,
+            chart_songs.c.song_id,
+            *CHART_TRACK_COLUMNS,
+        )
+        .select_from(latest_chart)
+        .outerjoin(chart_songs, chart_songs.c.chart_id == latest_chart.c.chartId)
+        .outerjoin(Song, Song.songId == chart_songs.c.song_id)
+        .outerjoin(Track, Track.trackId == Song.track_id)
+        .order_by(chart_songs.c.rank)
+        .limit(limit)
+    )
+    rows = result.fetchall()
+    if not rows:
+        return None
+
+    return {
+        "chartId": rows[0].chartId,
+        "chartType": period,
+        "generatedAt": rows[0].generatedAt,
+        # 빈 스냅샷이면 outer join 결과로 rank가 NULL인 행 하나만 나옴
+        "entries": [_chart_entry(row.rank, row, row.share_count) for row in rows if row.rank is not None],
+    }
+
+
+async def get_period_chart_from_snapshot(db: AsyncSession, period: str, limit: int = DEFAULT_CHART_SIZE) -> List[dict]:
+    """
+    최신 스냅샷으로 차트를 응답하고, 아직 스냅샷이 없으면 실시간으로 집계합니다.
+    """
+    snapshot = await get_chart_snapshot(db, period, limit)
+    if snapshot is None:
+        return await get_period_chart(db, period, limit)
+    return snapshot["entries"]
+
+
+async def get_cached_period_chart(period: str, limit: int = DEFAULT_CHART_SIZE) -> List[dict]:
+    """
+    기간 차트를 TTL 캐시에서 응답합니다. 동시에 들어온 미스는 한 번의 조회로 합쳐집니다.
+    """
+    async def load() -> List[dict]:
+        async with SessionLocal() as db:
+            return await get_period_chart_from_snapshot(db, period, MAX_CHART_SIZE)
+
+    entries = await chart_cache.get_or_load(period, load)
+    return entries[:limit]
+
+
+async def record_share(db: AsyncSession, song: Song) -> None:
+    """
+    공유 한 건을 daily_track_shares 집계에 반영합니다. (커밋은 호출자가 수행)
+    """
+    if not song.sharedAt:
+        return
+
+    stmt = pg_insert(DailyTrackShare).values(
+        day=song.sharedAt.date(), track_id=song.track_id, song_id=song.songId, share_count=1
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DailyTrackShare.day, DailyTrackShare.track_id],
+            set_={"share_count": DailyTrackShare.share_count + 1},
+        )
+    )
+
+
+async def rebuild_share_rollup(db: AsyncSession) -> int:
+    """
+    songs 원본으로부터 daily_track_shares 집계를 처음부터 다시 계산합니다.
+    """
+    day = cast(Song.sharedAt, Date)
+    totals = (
+        select(day, Song.track_id, func.min(Song.songId), func.count(Song.songId))
+        .where(Song.sharedAt.isnot(None))
+        .group_by(day, Song.track_id)
+    )
+
+    await db.execute(delete(DailyTrackShare))
+    result = await db.execute(
+        insert(DailyTrackShare).from_select(["day", "track_id", "song_id", "share_count"], totals)
+    )
+    await db.commit()
+    return result.rowcount
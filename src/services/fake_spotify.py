@@ -0,0 +1,127 @@
+# src/services/fake_spotify.py
+# 부하 테스트용 로컬 가짜 Spotify 서버 (토큰, 검색, 트랙 조회 API만 흉내 냄)
+# 실행: uvicorn src.services.fake_spotify:app --port 9000
+# 앱 설정: SPOTIFY_API_BASE_URL=http://localhost:9000, SPOTIFY_ACCOUNTS_BASE_URL=http://localhost:9000
+#
+# 환경 변수로 업스트림 상태를 조절합니다.
+# - FAKE_SPOTIFY_LATENCY_MS: 응답 지연 (기본 50)
+# - FAKE_SPOTIFY_ERROR_RATE: 500을 반환할 확률 0~1 (기본 0)
+# - FAKE_SPOTIFY_RATE_LIMIT: 초당 허용 요청 수, 넘으면 429 + Retry-After (기본 0 = 제한 없음)
+# - FAKE_SPOTIFY_RETRY_AFTER: 429 응답의 Retry-After 초 (기본 1)
+
+import asyncio
+import hashlib
+import os
+import random
+import time
+import uuid
+from typing import Optional, Set
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = float(os.getenv("FAKE_SPOTIFY_LATENCY_MS", 50))
+ERROR_RATE = float(os.getenv("FAKE_SPOTIFY_ERROR_RATE", 0))
+RATE_LIMIT = int(os.getenv("FAKE_SPOTIFY_RATE_LIMIT", 0))
+RETRY_AFTER = int(os.getenv("FAKE_SPOTIFY_RETRY_AFTER", 1))
+
+BASE62 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+app = FastAPI(title="Fake Spotify")
+
+_window_started = time.monotonic()
+_window_count = 0
+# 발급한 토큰. 목록에 없는 토큰(만료·폐기)으로 API를 호출하면 401
+issued_tokens: Set[str] = set()
+
+
+def _fake_track_id(seed: str) -> str:
+    digest = hashlib.sha256(seed.encode()).digest()
+    return "".join(BASE62[b % 62] for b in digest[:22])
+
+
+def _fake_track(track_id: str) -> Optional[dict]:
+    # ID가 "0"으로 시작하면 없는 트랙으로 취급 (네거티브 캐시 확인용)
+    if track_id.startswith("0"):
+        return None
+    return {
+        "id": track_id,
+        "name": f"Track {track_id[:6]}",
+        "uri": f"spotify:track:{track_id}",
+        "artists": [{"name": f"Artist {track_id[6:10]}"}],
+        "album": {
+            "name": f"Album {track_id[10:14]}",
+            "images": [{"url": f"https://i.scdn.co/image/{track_id}", "height": 640, "width": 640}],
+        },
+        "external_urls": {"spotify": f"https://open.spotify.com/track/{track_id}"},
+    }
+
+
+async def _simulate_upstream(authorization: Optional[str]) -> Optional[JSONResponse]:
+    """
+    토큰을 확인하고 설정된 지연, 레이트 리밋, 오류율을 적용합니다. 오류를 낼 차례면 응답을 반환
+    """
+    global _window_started, _window_count
+    token = (authorization or "").replace("Bearer ", "", 1)
+    if token not in issued_tokens:
+        return JSONResponse(status_code=401, content={"error": {"status": 401, "message": "The access token expired"}})
+
+    now = time.monotonic()
+    if now - _window_started >= 1:
+        _window_started, _window_count = now, 0
+    _window_count += 1
+    if RATE_LIMIT and _window_count > RATE_LIMIT:
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"status": 429, "message": "API rate limit exceeded"}},
+            headers={"Retry-After": str(RETRY_AFTER)},
+        )
+
+    await asyncio.sleep(random.expovariate(1000 / LATENCY_MS) if LATENCY_MS > 0 else 0)
+    if random.random() < ERROR_RATE:
+        return JSONResponse(status_code=500, content={"error": {"status": 500, "message": "Server error"}})
+    return None
+
+
+@app.post("/api/token")
+async def token():
+    # 자격 증명은 확인하지 않고 항상 토큰 발급
+    access_token = f"fake-{uuid.uuid4().hex}"
+    issued_tokens.add(access_token)
+    return {"access_token": access_token, "token_type": "Bearer", "expires_in": 3600}
+
+
+@app.get("/v1/search")
+async def search(
+    q: str,
+    type: str = "track",
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = 0,
+    authorization: Optional[str] = Header(None),
+):
+    error = await _simulate_upstream(authorization)
+    if error:
+        return error
+    items = [_fake_track(_fake_track_id(f"{q}:{offset + idx}")) for idx in range(limit)]
+    return {"tracks": {"items": [item for item in items if item], "limit": limit, "offset": offset}}
+
+
+@app.get("/v1/tracks/{track_id}")
+async def track(track_id: str, authorization: Optional[str] = Header(None)):
+    error = await _simulate_upstream(authorization)
+    if error:
+        return error
+    item = _fake_track(track_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Non existing id")
+    return item
+
+
+@app.get("/v1/tracks")
+async def tracks(ids: str, authorization: Optional[str] = Header(None)):
+    track_ids = ids.split(",")
+    if len(track_ids) > 50:
+        raise HTTPException(status_code=400, detail="Too many ids requested")
+    error = await _simulate_upstream(authorization)
+    if error:
+        return error
+    return {"tracks": [_fake_track(track_id) for track_id in track_ids]}
@@ -0,0 +1,406 @@
+# src/services/feed_service.py
+
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import asc, desc, tuple_, literal, union, delete, Integer, DateTime
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from src.models import User, Follow, Song, Track, FeedItem
+from src.database import SessionLocal
+from src.config.config import load_config
+from src.utils.cache import TTLCache
+
+config = load_config()
+
+# True면 공유 시점에 팔로워 인박스(feed_items)를 채우고, 피드 조회도 인박스에서 읽음
+FEED_FANOUT_ENABLED = config["FEED_FANOUT_ENABLED"]
+
+FEED_ITEM_COLUMNS = ["user_id", "song_id", "sharedBy", "sharedAt"]
+
+# 피드 응답 캐시: (user_id, 페이지 파라미터) -> 페이지. user_id 그룹 단위로 무효화
+feed_cache = TTLCache("feed", maxsize=config["FEED_CACHE_SIZE"], ttl=config["FEED_CACHE_TTL_SECONDS"])
+
+# 한 번에 내려줄 수 있는 피드 항목 수
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# 스트리밍 응답에서 서버 사이드 커서로 한 번에 가져올 행 수
+STREAM_BATCH_SIZE = 500
+
+# 델타 동기화 워터마크를 현재 시각보다 이만큼 과거로 잡음 (커밋 지연 대비)
+WATERMARK_SAFETY_MARGIN = timedelta(seconds=5)
+
+
+def encode_cursor(shared_at: datetime, song_id: int) -> str:
+    """
+    (sharedAt, songId) 위치를 클라이언트에 내려줄 불투명 커서 문자열로 변환합니다.
+    """
+    raw = f"{shared_at.isoformat()}|{song_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    encode_cursor로 만든 커서를 (sharedAt, songId)로 복원합니다.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        shared_at, song_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(shared_at), int(song_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def get_feed_author_ids(db: AsyncSession, user_id: int) -> List[int]:
+    """
+    피드에 노출될 작성자 ID 목록 (팔로우한 유저 + 자기 자신)
+    """
+    following_result = await db.execute(
+        select(Follow.following_id).where(Follow.follower_id == user_id)
+    )
+    author_ids = {row[0] for row in following_result.fetchall()}
+    author_ids.add(user_id)
+    return list(author_ids)
+
+
+# 피드 응답에 필요한 컬럼만 조회 (ORM 엔티티를 만들지 않고 Row 튜플로 바로 직렬화)
+FEED_COLUMNS = (
+    User.userId,
+    User.name,
+    User.profile_image_url,
+    Song.songId,
+    Track.title,
+    Track.artist,
+    Track.album_cover_url,
+    Song.sharedAt,
+    Song.reaction,
+    Track.spotify_url,
+    Track.uri,
+)
+
+
+def serialize_feed_row(row) -> dict:
+    return {
+        "id": row.userId,
+        "name": row.name,
+        "profileImage": row.profile_image_url,
+        "Song": {  # 단일 객체로 반환
+            "songId": row.songId,
+            "title": row.title,
+            "artist": row.artist,
+            "album_cover_url": row.album_cover_url,
+            "shared_at": row.sharedAt.isoformat(),  # ISO 포맷으로 변환
+            "reaction": row.reaction,
+            "spotify_url": row.spotify_url,
+            "uri": row.uri
+        }
+    }
+
+
+def invalidate_feed_cache(*user_ids: int) -> None:
+    for user_id in user_ids:
+        feed_cache.invalidate_group(user_id)
+
+
+async def invalidate_feeds_of_author(db: AsyncSession, author_id: int) -> None:
+    """
+    작성자의 노래가 노출되는 피드(작성자 본인 + 팔로워) 캐시를 모두 무효화합니다.
+    """
+    if not feed_cache.maxsize:
+        return
+    follower_result = await db.execute(
+        select(Follow.follower_id).where(Follow.following_id == author_id)
+    )
+    invalidate_feed_cache(author_id, *[row[0] for row in follower_result.fetchall()])
+
+
+async def _get_scope_author_ids(db: AsyncSession, user_id: int) -> Optional[List[int]]:
+    # 인박스를 쓰면 작성자 목록이 필요 없음
+    return None if FEED_FANOUT_ENABLED else await get_feed_author_ids(db, user_id)
+
+
+def _feed_scope(user_id: int, columns: tuple, author_ids: Optional[List[int]]):
+    """
+    사용자 피드에 속한 노래만 조회하는 기본 쿼리와 정렬 기준 컬럼 (sharedAt, songId)
+    """
+    if author_ids is None:
+        # 인박스에서 사용자 한 명 기준 인덱스 범위 조회
+        stmt = (
+            select(*columns)
+            .select_from(Song)
+            .join(FeedItem, FeedItem.song_id == Song.songId)
+            .join(Track, Track.trackId == Song.track_id)
+            .join(User, Song.sharedBy == User.userId)
+            .where(FeedItem.user_id == user_id)
+        )
+        return stmt, FeedItem.sharedAt, FeedItem.song_id
+
+    # 팔로우 목록 기준으로 songs 테이블에서 직접 조회 (pull)
+    stmt = (
+        select(*columns)
+        .select_from(Song)
+        .join(Track, Track.trackId == Song.track_id)
+        .join(User, Song.sharedBy == User.userId)
+        .where(Song.sharedBy.in_(author_ids))
+    )
+    return stmt, Song.sharedAt, Song.songId
+
+
+async def fetch_feed_page(
+    db: AsyncSession,
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    direction: str = "next",
+) -> dict:
+    """
+    (sharedAt, songId) 키셋 페이지네이션으로 피드 한 페이지를 조회합니다.
+    - 커서가 없으면 direction과 상관없이 가장 최근 페이지 (앱을 열면 최신 공유부터 보이도록)
+    - direction="next": 커서 이후(더 최근) 항목
+    - direction="prev": 커서 이전(더 오래된) 항목
+    페이지 안의 항목은 항상 오래된 순서로 정렬됩니다.
+    """
+    if cursor is None:
+        direction = "prev"
+    page_key = (user_id, cursor, limit, direction)
+    cached_page = feed_cache.get(page_key)
+    if cached_page is not None:
+        return cached_page
+    # 조회 중에 이 사용자의 피드가 공유·팔로우 등으로 무효화되면 이전 페이지를 캐시에 넣지 않도록 시작 시점의 epoch를 기억
+    cache_epoch = feed_cache.epoch
+
+    position = decode_cursor(cursor) if cursor else None
+    author_ids = await _get_scope_author_ids(db, user_id)
+    stmt, shared_at_col, song_id_col = _feed_scope(user_id, FEED_COLUMNS, author_ids)
+
+    sort_key = tuple_(shared_at_col, song_id_col)
+    if direction == "prev":
+        if position:
+            stmt = stmt.where(sort_key < tuple_(*position))
+        stmt = stmt.order_by(desc(shared_at_col), desc(song_id_col))
+    else:
+        if position:
+            stmt = stmt.where(sort_key > tuple_(*position))
+        stmt = stmt.order_by(asc(shared_at_col), asc(song_id_col))
+
+    # 다음 페이지 존재 여부를 알기 위해 하나 더 가져옴
+    result = await db.execute(stmt.limit(limit + 1))
+    rows = result.fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == "prev":
+        rows.reverse()
+
+    items = [serialize_feed_row(row) for row in rows]
+    first_cursor = encode_cursor(rows[0].sharedAt, rows[0].songId) if rows else None
+    last_cursor = encode_cursor(rows[-1].sharedAt, rows[-1].songId) if rows else None
+
+    if direction == "prev":
+        prev_cursor = first_cursor if has_more else None
+        next_cursor = last_cursor if position else None
+    else:
+        next_cursor = last_cursor if has_more else None
+        prev_cursor = first_cursor if position else None
+
+    page = {"items": items, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
+    feed_cache.set(page_key, page, group=user_id, epoch=cache_epoch)
+    return page
+
+
+def parse_watermark(since: str) -> datetime:
+    try:
+        watermark = datetime.fromisoformat(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+    # sharedAt은 naive UTC로 저장되므로 타임존이 붙은 입력은 UTC로 맞춤 (aware/naive 비교 오류 방지)
+    if watermark.tzinfo:
+        watermark = watermark.astimezone(timezone.utc).replace(tzinfo=None)
+    return watermark
+
+
+async def fetch_feed_delta(
+    db: AsyncSession,
+    user_id: int,
+    since: str,
+    limit: int = MAX_PAGE_SIZE,
+) -> dict:
+    """
+    since 워터마크 이후 새로 공유된 항목과, 클라이언트가 이미 가진 항목의 리액션 변경분만 조회합니다.
+    - items: since 이후 공유된 항목 (오래된 순, 최대 limit개)
+    - reactions: since 이전에 공유됐지만 since 이후 리액션이 바뀐 항목의 (songId, reaction) 목록 (리액션 시각 순, 최대 limit개)
+    - watermark: 다음 요청의 since 값. 어느 쪽이든 잘리면 빠진 부분부터 이어 받을 수 있는 시각으로 앞당겨지고,
+      경계 구간의 항목이 다시 올 수 있으므로 클라이언트는 songId로 중복 제거합니다.
+    """
+    since_at = parse_watermark(since)
+    # 응답 직전에 커밋된 공유를 놓치지 않도록 워터마크를 약간 과거로 잡음
+    now = datetime.utcnow() - WATERMARK_SAFETY_MARGIN
+
+    author_ids = await _get_scope_author_ids(db, user_id)
+    stmt, shared_at_col, song_id_col = _feed_scope(user_id, FEED_COLUMNS, author_ids)
+    result = await db.execute(
+        stmt.where(shared_at_col > since_at)
+        .order_by(asc(shared_at_col), asc(song_id_col))
+        .limit(limit + 1)
+    )
+    rows = result.fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # 잘린 경우 마지막 항목 시각부터 이어서 받도록 함
+    watermark = rows[-1].sharedAt if has_more else max(since_at, now)
+
+    reaction_stmt, shared_at_col, _ = _feed_scope(user_id, (Song.songId, Song.reaction, Song.reactedAt), author_ids)
+    reaction_stmt = reaction_stmt.where(shared_at_col <= since_at, Song.reactedAt > since_at)
+    reaction_result = await db.execute(reaction_stmt.order_by(Song.reactedAt, Song.songId).limit(limit + 1))
+    reaction_rows = reaction_result.fetchall()
+    if len(reaction_rows) > limit:
+        # 리액션 변경분도 limit개까지만 주고, 다음 요청이 빠진 변경분부터 받도록 워터마크를 앞당김.
+        # flush는 여러 곡에 같은 reactedAt을 쓰므로 잘린 지점과 같은 시각의 변경분은 다음 요청으로 넘김
+        boundary = reaction_rows[limit].reactedAt
+        kept = [row for row in reaction_rows[:limit] if row.reactedAt < boundary]
+        if kept:
+            reaction_rows = kept
+        else:
+            # limit개 전부가 같은 시각이면 앞으로 나아갈 수 없으므로 그 시각의 변경분은 모두 보냄
+            reaction_rows = (await db.execute(reaction_stmt.where(Song.reactedAt == boundary))).fetchall()
+        watermark = min(watermark, reaction_rows[-1].reactedAt)
+
+    return {
+        "items": [serialize_feed_row(row) for row in rows],
+        "watermark": watermark.isoformat(),
+        "reactions": [(row.songId, row.reaction) for row in reaction_rows],
+    }
+
+
+async def _stream_ndjson(build_stmt, serialize: Callable) -> AsyncIterator[bytes]:
+    """
+    서버 사이드 커서로 행을 조금씩 읽어 NDJSON 한 줄씩 내보냅니다.
+    요청 스코프의 get_db 세션은 응답 전송 전에 정리되므로 스트림 전용 세션을 직접 엽니다.
+    """
+    async with SessionLocal() as db:
+        stmt = await build_stmt(db)
+        result = await db.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for partition in result.partitions():
+            yield "".join(
+                json.dumps(serialize(row), ensure_ascii=False) + "\n" for row in partition
+            ).encode()
+
+
+def stream_feed_ndjson(user_id: int) -> AsyncIterator[bytes]:
+    """
+    피드 전체를 오래된 순서대로 NDJSON으로 스트리밍합니다.
+    """
+    async def build_stmt(db: AsyncSession):
+        author_ids = await _get_scope_author_ids(db, user_id)
+        stmt, shared_at_col, song_id_col = _feed_scope(user_id, FEED_COLUMNS, author_ids)
+        return stmt.order_by(asc(shared_at_col), asc(song_id_col))
+
+    return _stream_ndjson(build_stmt, serialize_feed_row)
+
+
+def serialize_share_row(row) -> dict:
+    share = row._asdict()
+    share["sharedAt"] = row.sharedAt.isoformat() if row.sharedAt else None
+    return share
+
+
+def stream_share_history_ndjson(user_id: int) -> AsyncIterator[bytes]:
+    """
+    사용자가 지금까지 공유한 노래 전체를 NDJSON으로 스트리밍합니다. (내보내기용)
+    """
+    async def build_stmt(db: AsyncSession):
+        return (
+            select(
+                Song.songId,
+                Track.title,
+                Track.artist,
+                Track.album,
+                Track.spotify_url,
+                Track.album_cover_url,
+                Track.uri,
+                Song.sharedAt,
+                Song.reaction,
+            )
+            .join(Track, Track.trackId == Song.track_id)
+            .where(Song.sharedBy == user_id)
+            .order_by(asc(Song.sharedAt), asc(Song.songId))
+        )
+
+    return _stream_ndjson(build_stmt, serialize_share_row)
+
+
+async def fanout_share(db: AsyncSession, song: Song) -> None:
+    """
+    새로 공유된 노래를 공유자 본인과 모든 팔로워의 인박스에 추가합니다. (커밋은 호출자가 수행)
+    """
+    if not FEED_FANOUT_ENABLED:
+        return
+
+    song_values = (
+        literal(song.songId, Integer),
+        literal(song.sharedBy, Integer),
+        literal(song.sharedAt, DateTime),
+    )
+    recipients = union(
+        select(Follow.follower_id, *song_values).where(Follow.following_id == song.sharedBy),
+        select(literal(song.sharedBy, Integer), *song_values),
+    )
+    await db.execute(
+        pg_insert(FeedItem).from_select(FEED_ITEM_COLUMNS, recipients).on_conflict_do_nothing()
+    )
+
+
+async def fanout_follow(db: AsyncSession, follower_id: int, following_id: int) -> None:
+    """
+    팔로우한 유저가 지금까지 공유한 노래를 팔로워의 인박스에 채워 넣습니다.
+    """
+    if not FEED_FANOUT_ENABLED:
+        return
+
+    songs = select(
+        literal(follower_id, Integer), Song.songId, Song.sharedBy, Song.sharedAt
+    ).where(Song.sharedBy == following_id, Song.sharedAt.isnot(None))
+    await db.execute(
+        pg_insert(FeedItem).from_select(FEED_ITEM_COLUMNS, songs).on_conflict_do_nothing()
+    )
+
+
+async def fanout_unfollow(db: AsyncSession, follower_id: int, following_id: int) -> None:
+    """
+    언팔로우한 유저의 노래를 팔로워의 인박스에서 제거합니다.
+    """
+    if not FEED_FANOUT_ENABLED:
+        return
+
+    await db.execute(
+        delete(FeedItem).where(FeedItem.user_id == follower_id, FeedItem.sharedBy == following_id)
+    )
+
+
+async def rebuild_feed_inbox(db: AsyncSession) -> int:
+    """
+    follows/songs 테이블로부터 feed_items 인박스 전체를 다시 만듭니다. (백필용)
+    스위치가 꺼져 있어도 실행할 수 있으므로, 인박스를 켜기 전에 먼저 실행해 둡니다.
+    """
+    follower_rows = (
+        select(Follow.follower_id, Song.songId, Song.sharedBy, Song.sharedAt)
+        .join(Song, Song.sharedBy == Follow.following_id)
+        .where(Song.sharedAt.isnot(None))
+    )
+    own_rows = (
+        select(Song.sharedBy.label("user_id"), Song.songId, Song.sharedBy, Song.sharedAt)
+        .where(Song.sharedBy.isnot(None), Song.sharedAt.isnot(None))
+    )
+
+    await db.execute(delete(FeedItem))
+    result = await db.execute(
+        pg_insert(FeedItem)
+        .from_select(FEED_ITEM_COLUMNS, union(follower_rows, own_rows))
+        .on_conflict_do_nothing()
+    )
+    await db.commit()
+    return result.rowcount
@@ -0,0 +1,105 @@
+# src/services/profile_service.py
+
+from typing import Optional
+from sqlalchemy import func, exists, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from src.models import User, Follow, Song, Track
+from src.config.config import load_config
+from src.utils.cache import TTLCache
+
+config = load_config()
+
+# 사용자별 (팔로워 수, 팔로잉 수, 공유 수). 팔로우/언팔로우/공유 시 무효화
+profile_counts_cache = TTLCache(
+    "profile_counts",
+    maxsize=config["PROFILE_COUNTS_CACHE_SIZE"],
+    ttl=config["PROFILE_COUNTS_CACHE_TTL_SECONDS"],
+)
+
+
+def invalidate_profile_counts(*user_ids: int) -> None:
+    for user_id in user_ids:
+        profile_counts_cache.invalidate(user_id)
+
+
+async def get_profile(db: AsyncSession, user_id: int, viewer_id: int) -> Optional[dict]:
+    """
+    사용자 정보, 팔로우 여부, 최근 공유곡을 한 번의 쿼리로 가져옵니다.
+    팔로워/팔로잉/공유 수는 캐시에 없을 때만 같은 쿼리에 스칼라 서브쿼리로 포함해 집계합니다.
+    사용자가 없으면 None
+    """
+    is_following = exists().where(Follow.follower_id == viewer_id, Follow.following_id == User.userId)
+    recent_song = (
+        select(
+            Track.title,
+            Track.artist,
+            Track.album,
+            Track.spotify_url,
+            Track.album_cover_url,
+            Song.sharedAt,
+        )
+        .join(Track, Track.trackId == Song.track_id)
+        .where(Song.sharedBy == User.userId)
+        .order_by(Song.sharedAt.desc())
+        .limit(1)
+        .lateral()
+    )
+
+    counts = profile_counts_cache.get(user_id)
+    # 집계 중에 팔로우·공유로 무효화되면 이전 수를 캐시에 넣지 않도록 시작 시점의 epoch를 기억
+    cache_epoch = profile_counts_cache.epoch
+    count_columns = []
+    if counts is None:
+        count_columns = [
+            select(func.count()).select_from(Follow).where(Follow.following_id == User.userId).scalar_subquery().label("follower_count"),
+            select(func.count()).select_from(Follow).where(Follow.follower_id == User.userId).scalar_subquery().label("following_count"),
+            select(func.count()).select_from(Song).where(Song.sharedBy == User.userId).scalar_subquery().label("share_count"),
+        ]
+
+    result = await db.execute(
+        select(
+            User.userId,
+            User.email,
+            User.name,
+            User.profile_image_url,
+            User.createdAt,
+            is_following.label("is_following"),
+            recent_song,
+            *count_columns,
+        )
+        .select_from(User)
+        .outerjoin(recent_song, true())  # 공유한 곡이 없어도 사용자 행은 나오도록 LEFT JOIN LATERAL
+        .where(User.userId == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+
+    if counts is None:
+        counts = {
+            "followers": row.follower_count,
+            "following": row.following_count,
+            "shares": row.share_count,
+        }
+        profile_counts_cache.set(user_id, counts, epoch=cache_epoch)
+
+    return {
+        "user": {
+            "email": row.email,
+            "name": row.name,
+            "profile_image_url": row.profile_image_url,
+            "createdAt": row.createdAt,
+            "userId": row.userId
+        },
+        "is_following": row.is_following,
+        "recent_shared_song": {
+            "title": row.title,
+            "artist": row.artist,
+            "album": row.album,
+            "spotify_url": row.spotify_url,
+            "sharedAt": row.sharedAt,
+            "album_cover_url": row.album_cover_url
+        } if row.title is not None else None,
+        "counts": counts,
+    }
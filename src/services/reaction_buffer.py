@@ -0,0 +1,130 @@
+# src/services/reaction_buffer.py
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import update, values, column, Integer
+from src.models import Song
+from src.database import SessionLocal
+from src.config.config import load_config
+from src.services.feed_service import invalidate_feeds_of_author
+
+logger = logging.getLogger(__name__)
+
+config = load_config()
+
+
+class ReactionBuffer:
+    """
+    리액션 증가분을 songId별로 모아 두었다가 주기적으로 한 번의 UPDATE로 반영하는 쓰기 지연 버퍼.
+    인기 곡에 탭이 몰려도 행 잠금은 flush마다 한 번만 잡힙니다.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._pending: Counter = Counter()
+        self._inflight: Counter = Counter()  # flush 중인 증가분 (커밋될 때까지 조회 값에 계속 포함)
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None  # 이벤트 루프가 뜬 뒤에 생성
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.flush_errors = 0
+
+    def add(self, song_id: int, count: int = 1) -> None:
+        self._pending[song_id] += count
+
+    def pending(self, song_id: int) -> int:
+        """
+        아직 DB에 반영되지 않은 증가분 (조회 시 저장된 값에 더해서 응답)
+        """
+        return self._pending.get(song_id, 0) + self._inflight.get(song_id, 0)
+
+    async def flush(self) -> int:
+        """
+        모인 증가분을 UPDATE songs SET reaction = reaction + n ... FROM (VALUES ...)로 한 번에 반영합니다.
+        실패하면 증가분을 버퍼에 되돌려 다음 flush에서 다시 시도합니다.
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, Counter()
+            self._inflight = batch
+
+            deltas = values(column("song_id", Integer), column("delta", Integer), name="deltas").data(
+                list(batch.items())
+            )
+            stmt = (
+                update(Song)
+                .where(Song.songId == deltas.c.song_id)
+                .values(reaction=Song.reaction + deltas.c.delta, reactedAt=datetime.utcnow())
+                .returning(Song.sharedBy)
+            )
+            async with SessionLocal() as db:
+                try:
+                    result = await db.execute(stmt)
+                    author_ids = {row[0] for row in result.fetchall()}
+                    await db.commit()
+                except Exception:
+                    self._pending.update(batch)
+                    self.flush_errors += 1
+                    raise
+                finally:
+                    self._inflight = Counter()
+
+                self.flushes += 1
+                self.flushed_rows += len(batch)
+                # 리액션 수가 바뀐 곡이 노출되는 피드 캐시 무효화
+                for author_id in author_ids:
+                    await invalidate_feeds_of_author(db, author_id)
+            return len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush reaction buffer")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """
+        주기 flush를 멈추고 남은 증가분을 마지막으로 반영합니다. (앱 종료 시 호출)
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            # 종료 과정의 나머지 정리(Spotify 연결, 트랙 캐시 저장)는 계속 진행되도록 예외를 삼키고 유실분을 기록
+            logger.exception(
+                "Dropped %d reactions on %d songs: final reaction flush failed",
+                sum(self._pending.values()),
+                len(self._pending),
+            )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending_songs": len(self._pending),
+            "pending_reactions": sum(self._pending.values()),
+            "inflight_reactions": sum(self._inflight.values()),
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "flush_errors": self.flush_errors,
+        }
+
+
+reaction_buffer = ReactionBuffer(config["REACTION_FLUSH_INTERVAL_MS"] / 1000)
+REACTION_BUFFER_ENABLED = config["REACTION_BUFFER_ENABLED"]
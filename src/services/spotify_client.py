@@ -0,0 +1,365 @@
+# src/services/spotify_client.py
+
+import asyncio
+import base64
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import httpx
+from src.config.config import load_config
+
+config = load_config()
+
+# 토큰 만료 직전 요청이 실패하지 않도록 여유를 두고 미리 갱신
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+# 업스트림 지연 통계 버킷 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class SpotifyError(Exception):
+    """
+    Spotify API가 오류 응답을 반환했을 때 발생
+    """
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Spotify API error {status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+
+class SpotifyUnavailableError(SpotifyError):
+    """
+    Spotify를 지금 호출할 수 없을 때 발생 (서킷 오픈, 레이트 리밋, 타임아웃/연결 오류).
+    라우터에서는 503으로 응답합니다.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(503, message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    클라이언트 측 레이트 리미터. 초당 rate개씩 토큰이 차고 최대 capacity개까지 쌓입니다.
+    토큰이 없으면 앞으로 찰 토큰을 미리 예약(잔량이 음수가 됨)하고 그 시각까지만 기다리므로,
+    대기 시간은 앞선 예약까지 포함해 계산되고 max_wait를 넘는 요청은 바로 실패합니다.
+    Spotify가 Retry-After를 주면 그 시각까지 토큰이 차지 않고 모든 요청이 멈춥니다.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self.waits = 0
+        self.rejected = 0
+
+    def block_for(self, seconds: float) -> None:
+        now = time.monotonic()
+        self._refill(now)
+        self._blocked_until = max(self._blocked_until, now + seconds)
+
+    def _refill(self, now: float) -> None:
+        # 차단 구간 동안에는 토큰이 차지 않음 (차단이 풀리는 순간 요청이 한꺼번에 몰리지 않도록)
+        started = max(self._updated_at, min(self._blocked_until, now))
+        self._tokens = min(self.capacity, self._tokens + max(0.0, now - started) * self.rate)
+        self._updated_at = now
+
+    def _reserve(self, max_wait: float) -> float:
+        """
+        토큰 하나를 예약하고 기다려야 할 시간을 반환합니다. max_wait를 넘으면 예약하지 않고 SpotifyUnavailableError
+        """
+        now = time.monotonic()
+        self._refill(now)
+        wait = max(0.0, self._blocked_until - now) + max(0.0, 1 - self._tokens) / self.rate
+        if wait > max_wait:
+            self.rejected += 1
+            raise SpotifyUnavailableError("Spotify rate limit reached", retry_after=wait)
+        self._tokens -= 1
+        return wait
+
+    async def acquire(self, max_wait: float) -> None:
+        """
+        토큰 하나를 얻을 때까지 기다립니다. max_wait초 이상 기다려야 하면 SpotifyUnavailableError
+        """
+        # 예약은 await 없이 끝나므로 락이 필요 없고, 대기는 각자 예약한 시각까지만 함
+        wait = self._reserve(max_wait)
+        if wait <= 0:
+            return
+        self.waits += 1
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self._tokens += 1  # 쓰지 않은 예약은 반납
+            raise
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold번 쌓이면 reset_timeout초 동안 호출을 바로 실패시키고(open),
+    그 뒤 한 번의 시험 호출(half-open)이 성공하면 다시 닫습니다.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.opened_count = 0
+        self.rejected = 0
+
+    def before_call(self) -> None:
+        if self.state == self.CLOSED:
+            return
+        remaining = self._opened_at + self.reset_timeout - time.monotonic()
+        if self.state == self.OPEN and remaining <= 0:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        self.rejected += 1
+        raise SpotifyUnavailableError("Spotify circuit breaker is open", retry_after=max(remaining, 1.0))
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def abort_trial(self) -> None:
+        # 시험 호출이 결과 없이 취소된 경우 다음 요청이 다시 시험할 수 있도록 함
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._trial_in_flight = False
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.opened_count += 1
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened_count": self.opened_count,
+            "rejected": self.rejected,
+        }
+
+
+class SpotifyClient:
+    """
+    Client Credentials 인증을 사용하는 비동기 Spotify Web API 클라이언트.
+    하나의 httpx.AsyncClient를 재사용해 keep-alive 연결을 풀링하고, 토큰은 만료 전에 한 번만 갱신합니다.
+    모든 API 호출은 토큰 버킷과 서킷 브레이커를 거치며, 429는 Retry-After만큼 기다렸다가 재시도합니다.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        api_base_url: str = "https://api.spotify.com",
+        accounts_base_url: str = "https://accounts.spotify.com",
+        timeout: float = 5.0,
+        max_connections: int = 20,
+        rate_limit_per_second: float = 20.0,
+        max_wait_seconds: float = 2.0,
+        max_retries: int = 2,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.api_base_url = api_base_url.rstrip("/")
+        self.accounts_base_url = accounts_base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_wait_seconds = max_wait_seconds
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(rate_limit_per_second, capacity=rate_limit_per_second)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._http: Optional[httpx.AsyncClient] = None
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock: Optional[asyncio.Lock] = None  # 이벤트 루프가 뜬 뒤에 생성
+        self.requests: Counter = Counter()  # 엔드포인트별 업스트림 호출 수
+        self.errors: Counter = Counter()  # "엔드포인트:상태" 별 오류 수
+        self.token_refreshes = 0
+        self.rate_limited = 0  # Spotify가 429를 반환한 횟수
+        self.latency_count: Counter = Counter()
+        self.latency_total: Counter = Counter()
+        self.latency_max: Dict[str, float] = {}
+        self.latency_buckets: Dict[str, Counter] = {}
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._http
+
+    async def _get_token(self, force_refresh: bool = False) -> str:
+        if not force_refresh and self._token and time.monotonic() < self._token_expires_at:
+            return self._token
+
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        async with self._token_lock:
+            # 락을 기다리는 동안 다른 요청이 이미 갱신했으면 그 토큰을 사용
+            if not force_refresh and self._token and time.monotonic() < self._token_expires_at:
+                return self._token
+
+            credentials = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
+            try:
+                response = await self.http.post(
+                    f"{self.accounts_base_url}/api/token",
+                    data={"grant_type": "client_credentials"},
+                    headers={"Authorization": f"Basic {credentials}"},
+                )
+            except httpx.HTTPError as e:
+                self.errors[f"token:{type(e).__name__}"] += 1
+                raise SpotifyUnavailableError(f"Spotify token request failed: {type(e).__name__}") from e
+            if response.status_code != 200:
+                self.errors[f"token:{response.status_code}"] += 1
+                raise SpotifyError(response.status_code, response.text)
+
+            payload = response.json()
+            self.token_refreshes += 1
+            self._token = payload["access_token"]
+            self._token_expires_at = time.monotonic() + payload.get("expires_in", 3600) - TOKEN_REFRESH_MARGIN_SECONDS
+            return self._token
+
+    def _observe(self, endpoint: str, elapsed: float) -> None:
+        self.latency_count[endpoint] += 1
+        self.latency_total[endpoint] += elapsed
+        self.latency_max[endpoint] = max(self.latency_max.get(endpoint, 0.0), elapsed)
+        buckets = self.latency_buckets.setdefault(endpoint, Counter())
+        bucket = next((f"le_{b}" for b in LATENCY_BUCKETS if elapsed <= b), "le_inf")
+        buckets[bucket] += 1
+
+    async def _send(self, endpoint: str, path: str, params: Optional[Dict[str, Any]], token: str) -> httpx.Response:
+        """
+        레이트 리밋과 서킷 브레이커를 거쳐 요청 한 번을 보냅니다.
+        """
+        # 서킷이 열려 있으면 레이트 리미터에서 기다리지 않고 바로 실패
+        self.breaker.before_call()
+        try:
+            await self.bucket.acquire(self.max_wait_seconds)
+        except BaseException:
+            self.breaker.abort_trial()
+            raise
+        self.requests[endpoint] += 1
+        started = time.monotonic()
+        try:
+            response = await self.http.get(
+                f"{self.api_base_url}{path}", params=params, headers={"Authorization": f"Bearer {token}"}
+            )
+        except asyncio.CancelledError:
+            self.breaker.abort_trial()
+            raise
+        except httpx.HTTPError as e:
+            self._observe(endpoint, time.monotonic() - started)
+            self.errors[f"{endpoint}:{type(e).__name__}"] += 1
+            self.breaker.record_failure()
+            raise SpotifyUnavailableError(f"Spotify request failed: {type(e).__name__}") from e
+        self._observe(endpoint, time.monotonic() - started)
+
+        # 429와 5xx만 업스트림 장애로 보고 서킷에 반영 (400/404 등은 정상 응답)
+        if response.status_code == 429 or response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    async def _get(self, endpoint: str, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        token = await self._get_token()
+        for attempt in range(self.max_retries + 1):
+            response = await self._send(endpoint, path, params, token)
+            if response.status_code == 401:
+                # 토큰이 서버 쪽에서 먼저 만료된 경우 갱신 후 재시도
+                token = await self._get_token(force_refresh=True)
+                continue
+            if response.status_code == 429:
+                self.rate_limited += 1
+                retry_after = float(response.headers.get("Retry-After", 1))
+                self.bucket.block_for(retry_after)  # 다른 요청들도 Retry-After 동안 멈춤
+                if retry_after > self.max_wait_seconds or attempt == self.max_retries:
+                    self.errors[f"{endpoint}:429"] += 1
+                    raise SpotifyUnavailableError("Spotify rate limit exceeded", retry_after=retry_after)
+                continue
+            break
+
+        if response.status_code != 200:
+            self.errors[f"{endpoint}:{response.status_code}"] += 1
+            if response.status_code >= 500:
+                raise SpotifyUnavailableError(f"Spotify returned {response.status_code}")
+            raise SpotifyError(response.status_code, response.text)
+        return response.json()
+
+    async def search(self, query: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        return await self._get("search", "/v1/search", {"q": query, "type": "track", "limit": limit, "offset": offset})
+
+    async def track(self, track_id: str) -> Dict[str, Any]:
+        return await self._get("track", f"/v1/tracks/{track_id}")
+
+    async def tracks(self, track_ids: List[str]) -> Dict[str, Any]:
+        return await self._get("tracks", "/v1/tracks", {"ids": ",".join(track_ids)})
+
+    def stats(self) -> dict:
+        return {
+            "requests": dict(self.requests),
+            "errors": dict(self.errors),
+            "token_refreshes": self.token_refreshes,
+            "rate_limited": self.rate_limited,
+            "throttle_waits": self.bucket.waits,
+            "throttle_rejected": self.bucket.rejected,
+            "circuit": self.breaker.stats(),
+            "latency": {
+                endpoint: {
+                    "count": count,
+                    "avg_seconds": round(self.latency_total[endpoint] / count, 4),
+                    "max_seconds": round(self.latency_max[endpoint], 4),
+                    "buckets": dict(self.latency_buckets[endpoint]),
+                }
+                for endpoint, count in self.latency_count.items()
+            },
+        }
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+def track_id_from_uri(song_uri: str) -> str:
+    """
+    spotify:track:<id>, https://open.spotify.com/track/<id>, <id> 형식을 모두 트랙 ID로 변환
+    """
+    if song_uri.startswith("spotify:"):
+        return song_uri.split(":")[-1]
+    if "/track/" in song_uri:
+        return song_uri.split("/track/")[1].split("?")[0]
+    return song_uri
+
+
+spotify_client = SpotifyClient(
+    client_id=config["SPOTIFY_CLIENT_ID"],
+    client_secret=config["SPOTIFY_CLIENT_SECRET"],
+    api_base_url=config["SPOTIFY_API_BASE_URL"],
+    accounts_base_url=config["SPOTIFY_ACCOUNTS_BASE_URL"],
+    timeout=config["SPOTIFY_TIMEOUT_SECONDS"],
+    rate_limit_per_second=config["SPOTIFY_RATE_LIMIT_PER_SECOND"],
+    max_wait_seconds=config["SPOTIFY_MAX_WAIT_SECONDS"],
+    failure_threshold=config["SPOTIFY_CIRCUIT_FAILURE_THRESHOLD"],
+    reset_timeout=config["SPOTIFY_CIRCUIT_RESET_SECONDS"],
+)
@@ -1,27 +1,174 @@
 # src/services/spotify_service.py
 
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
-from typing import List, Optional, Dict
-from src.config.config import load_config  # 새로운 파일 구조에 맞추어 import
+import asyncio
+import logging
+import re
+import unicodedata
+from typing import Any, List, Optional, Dict, Set
+from src.config.config import load_config
+from src.services.spotify_client import (
+    spotify_client, track_id_from_uri, SpotifyClient, SpotifyError, SpotifyUnavailableError,
+)
+from src.services.track_service import search_tracks, save_tracks
+from src.utils.cache import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
 
-# 환경 변수 로드
 config = load_config()
 
-# Spotify API 인증 설정
-client_credentials_manager = SpotifyClientCredentials(
-    client_id=config["SPOTIFY_CLIENT_ID"],
-    client_secret=config["SPOTIFY_CLIENT_SECRET"]
+# 트랙 메타데이터는 사실상 바뀌지 않으므로 길게 캐시하고, 없는 트랙(None)은 짧게 캐시
+track_cache = TTLCache(
+    "spotify_tracks",
+    maxsize=config["TRACK_CACHE_SIZE"],
+    ttl=config["TRACK_CACHE_TTL_SECONDS"],
+    negative_ttl=config["TRACK_CACHE_NEGATIVE_TTL_SECONDS"],
+)
+TRACK_CACHE_PATH = config["TRACK_CACHE_PATH"]
+
+# Spotify 트랙 ID는 base62 22자. 형식이 틀린 ID가 배치에 섞이면 배치 전체가 400이 되므로 미리 걸러냄
+SPOTIFY_TRACK_ID = re.compile(r"[0-9A-Za-z]{22}")
+# GET /v1/tracks가 한 번에 받는 최대 ID 수
+MAX_TRACKS_PER_REQUEST = 50
+
+
+class TrackLoader:
+    """
+    짧은 시간(window_seconds) 동안 들어온 트랙 조회를 모아 중복을 제거하고
+    GET /v1/tracks?ids=... 한 번(최대 50개)으로 조회한 뒤 각 요청에 결과를 나눠 주는 데이터 로더.
+    """
+
+    def __init__(self, client: SpotifyClient, window_seconds: float, max_batch_size: int = MAX_TRACKS_PER_REQUEST):
+        self.client = client
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[str, "asyncio.Future"] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.loaded_ids = 0
+
+    async def load(self, track_id: str) -> Optional[Dict[str, Any]]:
+        """
+        트랙 원본 JSON을 반환합니다. Spotify에 없는 트랙이면 None
+        """
+        future = self._pending.get(track_id)
+        if future is None:
+            loop = asyncio.get_event_loop()
+            future = loop.create_future()
+            self._pending[track_id] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window_seconds, self._dispatch)
+        # 한 요청이 취소돼도 같은 트랙을 기다리는 다른 요청에는 영향이 없도록 함
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            asyncio.ensure_future(self._load_batch(batch))
+
+    async def _load_batch(self, batch: Dict[str, "asyncio.Future"]) -> None:
+        track_ids = list(batch)
+        self.batches += 1
+        self.loaded_ids += len(track_ids)
+        # 응답이 깨졌거나 요청보다 짧아서 결과를 받지 못한 요청도 영원히 기다리지 않도록 모두 실패 처리
+        error: Exception = SpotifyError(502, "Track missing from Spotify batch response")
+        try:
+            payload = await self.client.tracks(track_ids)
+            # 응답은 요청한 ID 순서대로이며, 없는 트랙은 null
+            for track_id, track in zip(track_ids, payload["tracks"]):
+                if not batch[track_id].done():
+                    batch[track_id].set_result(track)
+        except Exception as e:
+            error = e
+        finally:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(error)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "loaded_ids": self.loaded_ids,
+            "avg_batch_size": round(self.loaded_ids / self.batches, 2) if self.batches else None,
+            "pending": len(self._pending),
+        }
+
+
+track_loader = TrackLoader(spotify_client, config["SPOTIFY_BATCH_WINDOW_MS"] / 1000)
+
+# 검색어별 상위 SEARCH_WINDOW_SIZE개 결과를 캐시하고 offset/limit 페이지는 그 안에서 잘라서 응답
+SEARCH_WINDOW_SIZE = 40
+search_cache = TTLCache(
+    "spotify_search",
+    maxsize=config["SEARCH_CACHE_SIZE"],
+    ttl=config["SEARCH_CACHE_TTL_SECONDS"],
+    negative_ttl=min(60.0, config["SEARCH_CACHE_TTL_SECONDS"]),
 )
 
-spotify = spotipy.Spotify(client_credentials_manager=client_credentials_manager)
+# 로컬 카탈로그 결과가 이만큼(또는 요청 페이지 끝까지) 있으면 Spotify를 호출하지 않음
+LOCAL_SEARCH_MIN_RESULTS = config["LOCAL_SEARCH_MIN_RESULTS"]
+
+# 진행 중인 카탈로그 저장 작업 (태스크가 끝나기 전에 GC되지 않도록 참조 유지)
+_write_back_tasks: Set["asyncio.Task"] = set()
+
+def _write_back(tracks: List[Dict[str, str]]) -> None:
+    task = asyncio.ensure_future(save_tracks(tracks))
+    _write_back_tasks.add(task)
+    task.add_done_callback(_write_back_done)
+
+def _write_back_done(task: "asyncio.Task") -> None:
+    _write_back_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Failed to save searched tracks to catalog: %s", task.exception())
+
+def normalize_query(query: str) -> str:
+    """
+    캐시 키용 검색어 정규화: NFKC(한글 자모 결합, 전각 문자 변환), 대소문자 통일, 공백 정리
+    """
+    return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+
+async def get_song_info(song_name: str, offset: int = 0, limit: int = SEARCH_WINDOW_SIZE) -> Optional[List[Dict[str, str]]]:
+    """
+    Spotify에서 검색된 노래 정보를 가져옵니다. 앨범 커버 이미지 URL과 URI 포함.
+    같은 검색어(정규화 기준)는 캐시된 결과 창에서 offset/limit만큼 잘라 반환합니다.
+    """
+    query = normalize_query(song_name)
+    if not query:
+        return None
+    songs = await search_cache.get_or_load(query, lambda: _search_songs(query))
+    if not songs:
+        return None
+    return songs[offset:offset + limit] or None
 
-def get_song_info(song_name: str) -> Optional[List[Dict[str, str]]]:
+async def search_songs(db: AsyncSession, song_name: str, offset: int = 0, limit: int = SEARCH_WINDOW_SIZE) -> Optional[List[Dict[str, str]]]:
     """
-    Spotify에서 검색된 모든 노래의 정보를 가져옵니다. 앨범 커버 이미지 URL과 URI 포함.
+    로컬 트랙 카탈로그에서 먼저 검색하고, 결과가 부족할 때만 Spotify 검색(get_song_info)을 호출합니다.
+    Spotify가 서킷 오픈·레이트 리밋 등으로 응답할 수 없으면 로컬 결과가 있는 한 그것을 반환합니다.
     """
-    results = spotify.search(q=song_name, type="track", limit=40)  # 최대 40개의 결과 반환
+    query = normalize_query(song_name)
+    if not query:
+        return None
+    local = await search_tracks(db, query, SEARCH_WINDOW_SIZE)
+    if len(local) >= min(SEARCH_WINDOW_SIZE, max(LOCAL_SEARCH_MIN_RESULTS, offset + limit)):
+        return local[offset:offset + limit] or None
+    try:
+        return await get_song_info(query, offset, limit)
+    except SpotifyUnavailableError:
+        # Spotify를 지금 호출할 수 없으면 부족하더라도 이미 찾은 로컬 결과로 응답
+        if not local:
+            raise
+        return local[offset:offset + limit] or None
+
+async def _search_songs(song_name: str) -> Optional[List[Dict[str, str]]]:
+    results = await spotify_client.search(song_name, limit=SEARCH_WINDOW_SIZE)  # 최대 40개의 결과 반환
     if results['tracks']['items']:
+        # 받은 트랙은 응답과 별개로 로컬 카탈로그에 저장해 다음 검색부터는 DB에서 응답
+        _write_back([_song_details(track) for track in results['tracks']['items']])
         song_list = []
         for track in results['tracks']['items']:
             # 앨범 커버 이미지 URL 추출
@@ -41,25 +188,65 @@ def get_song_info(song_name: str) -> Optional[List[Dict[str, str]]]:
     else:
         return None
 
-def get_song_details(song_uri: str) -> Optional[Dict[str, str]]:
+def _song_details(track: Dict[str, Any]) -> Dict[str, str]:
+    album_images = track['album']['images']
+    album_cover_url = album_images[0]['url'] if album_images else None
+
+    return {
+        "title": track['name'],
+        "artist": track['artists'][0]['name'],
+        "album": track['album']['name'],
+        # "release_date": track['album']['release_date'],
+        "spotify_url": track['external_urls']['spotify'],
+        "album_cover_url": album_cover_url,
+        "uri": track['uri']
+    }
+
+async def _fetch_song_details(track_id: str) -> Optional[Dict[str, str]]:
+    """
+    데이터 로더를 통해 Spotify에서 트랙을 조회합니다. 없는 트랙이면 None을 반환해 캐시하고,
+    그 외의 오류는 캐시하지 않도록 예외를 그대로 올립니다.
+    """
+    if not SPOTIFY_TRACK_ID.fullmatch(track_id):
+        return None
+    track = await track_loader.load(track_id)
+    return _song_details(track) if track else None
+
+async def get_song_details(song_uri: str) -> Optional[Dict[str, str]]:
     """
-    URI를 사용하여 노래의 상세 정보를 가져옵니다.
+    URI를 사용하여 노래의 상세 정보를 가져옵니다. (트랙 ID 기준으로 캐시)
     """
+    track_id = track_id_from_uri(song_uri)
     try:
-        track = spotify.track(song_uri)
-        album_images = track['album']['images']
-        album_cover_url = album_images[0]['url'] if album_images else None
-
-        song_info = {
-            "title": track['name'],
-            "artist": track['artists'][0]['name'],
-            "album": track['album']['name'],
-            # "release_date": track['album']['release_date'],
-            "spotify_url": track['external_urls']['spotify'],
-            "album_cover_url": album_cover_url,
-            "uri": track['uri']
-        }
-        return song_info
-    except Exception as e:
-        print(f"Error fetching song details: {e}")
-        return None
\ No newline at end of file
+        return await track_cache.get_or_load(track_id, lambda: _fetch_song_details(track_id))
+    except SpotifyUnavailableError:
+        raise  # 업스트림 장애는 404로 숨기지 않고 503으로 응답
+    except SpotifyError as e:
+        logger.warning("Error fetching song details for %s: %s", song_uri, e)
+        return None
+
+async def get_song_details_batch(song_uris: List[str]) -> Dict[str, Optional[Dict[str, str]]]:
+    """
+    여러 URI의 상세 정보를 한 번에 가져옵니다. 캐시에 없는 트랙은 데이터 로더가 50개씩 묶어 조회합니다.
+    """
+    unique_uris = list(dict.fromkeys(song_uris))
+    details = await asyncio.gather(*[get_song_details(uri) for uri in unique_uris])
+    return dict(zip(unique_uris, details))
+
+def load_track_cache() -> None:
+    """
+    TRACK_CACHE_PATH가 설정돼 있으면 디스크에 저장된 트랙 캐시를 불러옵니다. (앱 시작 시)
+    """
+    if TRACK_CACHE_PATH:
+        loaded = track_cache.load_json(TRACK_CACHE_PATH)
+        logger.info("Restored %d cached Spotify tracks from %s", loaded, TRACK_CACHE_PATH)
+
+def save_track_cache() -> None:
+    """
+    TRACK_CACHE_PATH가 설정돼 있으면 트랙 캐시를 디스크에 저장합니다. (앱 종료 시)
+    """
+    if TRACK_CACHE_PATH:
+        try:
+            track_cache.save_json(TRACK_CACHE_PATH)
+        except OSError as e:
+            logger.warning("Failed to save Spotify track cache to %s: %s", TRACK_CACHE_PATH, e)
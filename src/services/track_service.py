@@ -0,0 +1,95 @@
+# src/services/track_service.py
+
+import re
+from typing import Dict, List, Optional
+from fastapi import HTTPException
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from src.models import Track
+from src.database import SessionLocal
+
+# https://open.spotify.com/track/<id>?si=... 형태의 URL에서 트랙 ID 추출
+SPOTIFY_TRACK_URL = re.compile(r"/track/([A-Za-z0-9]+)")
+
+
+def track_uri_for(uri: Optional[str], spotify_url: Optional[str]) -> str:
+    """
+    트랙을 식별할 Spotify URI. URI가 없으면 Spotify URL에서 만들어 냅니다.
+    """
+    if uri:
+        return uri
+    match = SPOTIFY_TRACK_URL.search(spotify_url or "")
+    if not match:
+        raise HTTPException(status_code=400, detail="Song uri is required")
+    return f"spotify:track:{match.group(1)}"
+
+
+async def upsert_track(
+    db: AsyncSession,
+    uri: str,
+    title: str,
+    artist: str,
+    album: str,
+    spotify_url: str,
+    album_cover_url: Optional[str] = None,
+) -> Track:
+    """
+    URI 기준으로 트랙을 한 번의 INSERT ... ON CONFLICT로 만들거나 기존 행을 반환합니다.
+    tracks 행은 모든 공유·피드·차트가 함께 참조하므로 이미 있는 곡 정보는 클라이언트 값으로 덮어쓰지 않고,
+    비어 있는 앨범 커버만 채웁니다. (Spotify에서 저장한 정보가 우선)
+    """
+    stmt = pg_insert(Track).values(
+        uri=uri,
+        title=title,
+        artist=artist,
+        album=album,
+        spotify_url=spotify_url,
+        album_cover_url=album_cover_url,
+    )
+    # DO NOTHING은 충돌 시 행을 반환하지 않으므로, 기존 값을 유지하는 DO UPDATE로 한 번에 받아 옴
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Track.uri],
+        set_={"album_cover_url": func.coalesce(Track.album_cover_url, stmt.excluded.album_cover_url)},
+    ).returning(Track)
+    result = await db.execute(stmt, execution_options={"populate_existing": True})
+    return result.scalar_one()
+
+
+def _like_pattern(query: str) -> str:
+    # 검색어에 들어 있는 LIKE 특수문자는 그대로 매칭되도록 이스케이프
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+async def search_tracks(db: AsyncSession, query: str, limit: int) -> List[Dict[str, Optional[str]]]:
+    """
+    로컬 tracks 카탈로그에서 제목/아티스트로 검색합니다. (트라이그램 인덱스 사용)
+    제목·아티스트 중 검색어와 더 비슷한 쪽의 유사도 순으로 정렬합니다.
+    """
+    pattern = _like_pattern(query)
+    score = func.greatest(func.similarity(Track.title, query), func.similarity(Track.artist, query))
+    result = await db.execute(
+        select(Track.title, Track.artist, Track.album_cover_url, Track.uri)
+        .where(
+            or_(Track.title.ilike(pattern), Track.artist.ilike(pattern)),
+            Track.uri.like("spotify:track:%"),  # 마이그레이션 때 만든 로컬 키 트랙은 제외
+        )
+        .order_by(score.desc(), Track.trackId)
+        .limit(limit)
+    )
+    return [dict(row._mapping) for row in result]
+
+
+async def save_tracks(tracks: List[Dict[str, Optional[str]]]) -> None:
+    """
+    Spotify에서 받은 트랙들을 로컬 카탈로그에 한 번의 INSERT로 저장합니다. 이미 있는 URI는 건너뜀
+    (검색 응답과 별도로 실행되므로 자체 세션을 엶)
+    """
+    if not tracks:
+        return
+    rows = list({track["uri"]: track for track in tracks}.values())
+    async with SessionLocal() as db:
+        await db.execute(pg_insert(Track).values(rows).on_conflict_do_nothing(index_elements=[Track.uri]))
+        await db.commit()
@@ -0,0 +1,314 @@
+# src/utils/cache.py
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# 이름별로 등록된 캐시 (/metrics/caches 에서 통계 노출)
+_registry: Dict[str, "LRUCache"] = {}
+
+
+class LRUCache:
+    """
+    프로세스 내 최대 크기 제한 LRU 캐시. 적중/미스/축출 횟수를 함께 집계합니다.
+    항목을 그룹(예: user_id)에 묶어 두면 invalidate_group으로 한 번에 무효화할 수 있습니다.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024):
+        self.name = name
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._key_group: Dict[Hashable, Hashable] = {}
+        self._groups: Dict[Hashable, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        _registry[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any, group: Optional[Hashable] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        self._discard(key)
+        self._data[key] = value
+        if group is not None:
+            self._key_group[key] = group
+            self._groups.setdefault(group, set()).add(key)
+        while len(self._data) > self.maxsize:
+            oldest = next(iter(self._data))
+            self._discard(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        if self._discard(key):
+            self.invalidations += 1
+
+    def invalidate_group(self, group: Hashable) -> None:
+        for key in list(self._groups.get(group, ())):
+            self.invalidate(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._key_group.clear()
+        self._groups.clear()
+
+    def _discard(self, key: Hashable) -> bool:
+        if key not in self._data:
+            return False
+        del self._data[key]
+        group = self._key_group.pop(key, None)
+        if group is not None:
+            keys = self._groups[group]
+            keys.discard(key)
+            if not keys:
+                del self._groups[group]
+        return True
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class TTLCache(LRUCache):
+    """
+    항목마다 저장 시각을 기록해 ttl초가 지나면 만료되는 LRU 캐시.
+    get_or_load는 같은 키의 동시 미스를 하나의 로드로 합치고(single-flight),
+    serve_stale이면 만료된 값을 바로 돌려주면서 백그라운드에서 한 번만 다시 로드합니다.
+    negative_ttl을 주면 None 값("없음" 결과)은 그 시간 동안만 캐시합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        serve_stale: bool = False,
+        negative_ttl: Optional[float] = None,
+    ):
+        super().__init__(name, maxsize)
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.serve_stale = serve_stale
+        self._inflight: Dict[Hashable, "asyncio.Future"] = {}
+        # 무효화마다 증가하는 시계와 그룹(또는 그룹 없는 키)별 마지막 무효화 시각.
+        # 로드 시작 전에 읽은 epoch 이후 같은 그룹이 무효화됐으면 그 로드 결과는 저장하지 않음
+        self._epoch = 0
+        self._invalidated_at: "OrderedDict[tuple, int]" = OrderedDict()
+        self._epoch_floor = 0  # clear()나 오래된 기록 정리 이전에 시작된 로드는 모두 버림
+        self.stale_hits = 0
+        self.coalesced = 0
+        self.load_errors = 0
+
+    @staticmethod
+    def _is_fresh(entry: tuple) -> bool:
+        _, stored_at, ttl = entry
+        return time.monotonic() - stored_at < ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is not None and self._is_fresh(entry):
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return default
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    def _is_invalidated_since(self, key: Hashable, group: Optional[Hashable], epoch: int) -> bool:
+        if epoch < self._epoch_floor:
+            return True
+        marker = ("group", group) if group is not None else ("key", key)
+        return self._invalidated_at.get(marker, -1) > epoch
+
+    def _mark_invalidated(self, marker: tuple) -> None:
+        self._epoch += 1
+        self._invalidated_at[marker] = self._epoch
+        self._invalidated_at.move_to_end(marker)
+        # 기록은 무효화 순서대로이므로 가장 오래된 것부터 버리고, 그 시각 이전에 시작된 로드는 floor로 막음
+        while len(self._invalidated_at) > max(self.maxsize, 1024):
+            _, invalidated_at = self._invalidated_at.popitem(last=False)
+            self._epoch_floor = max(self._epoch_floor, invalidated_at)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        group: Optional[Hashable] = None,
+        stored_at: Optional[float] = None,
+        epoch: Optional[int] = None,
+    ) -> None:
+        """
+        epoch를 주면 (로드 시작 전에 읽어 둔 self.epoch) 그 사이에 같은 그룹(그룹이 없으면 같은 키)이
+        무효화됐을 때 저장하지 않습니다. 다른 그룹의 무효화는 영향을 주지 않습니다.
+        """
+        if epoch is not None and self._is_invalidated_since(key, group, epoch):
+            return
+        ttl = self.negative_ttl if value is None else self.ttl
+        super().set(key, (value, time.monotonic() if stored_at is None else stored_at, ttl), group)
+
+    def invalidate(self, key: Hashable) -> None:
+        group = self._key_group.get(key)
+        self._mark_invalidated(("group", group) if group is not None else ("key", key))
+        super().invalidate(key)
+
+    def invalidate_group(self, group: Hashable) -> None:
+        # 그룹에 아직 저장된 항목이 없어도 진행 중인 로드가 이전 값을 저장하지 않도록 표시
+        self._mark_invalidated(("group", group))
+        super().invalidate_group(group)
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._epoch_floor = self._epoch
+        self._invalidated_at.clear()
+        super().clear()
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        group: Optional[Hashable] = None,
+    ) -> Any:
+        """
+        캐시된 값을 반환하고, 없거나 만료됐으면 loader로 로드합니다.
+        loader는 요청 세션이 닫힌 뒤에도 실행될 수 있으므로 자체 세션을 열어야 합니다.
+        """
+        entry = self._data.get(key)
+        if entry is not None:
+            value = entry[0]
+            if self._is_fresh(entry):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            if self.serve_stale:
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                self._start_load(key, loader, group)
+                return value
+
+        if key in self._inflight:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        # 기다리던 요청이 취소돼도 다른 대기자를 위한 로드는 계속 진행
+        return await asyncio.shield(self._start_load(key, loader, group))
+
+    def _start_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], group: Optional[Hashable]) -> "asyncio.Future":
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader, group, self._epoch))
+            self._inflight[key] = task
+            task.add_done_callback(partial(self._load_done, key))
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], group: Optional[Hashable], epoch: int) -> Any:
+        value = await loader()
+        self.set(key, value, group, epoch=epoch)
+        return value
+
+    def _load_done(self, key: Hashable, task: "asyncio.Future") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.load_errors += 1
+            logger.warning("Cache %s failed to load %r: %s", self.name, key, task.exception())
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        served = self.hits + self.stale_hits + self.coalesced
+        lookups = served + self.misses
+        now = time.monotonic()
+        ages = [now - stored_at for _, stored_at, _ in self._data.values()]
+        stats.update({
+            "hit_ratio": round(served / lookups, 4) if lookups else None,
+            "ttl_seconds": self.ttl,
+            "negative_ttl_seconds": self.negative_ttl,
+            "negative_entries": sum(1 for value, _, _ in self._data.values() if value is None),
+            "serve_stale": self.serve_stale,
+            "stale_hits": self.stale_hits,
+            "coalesced": self.coalesced,
+            "load_errors": self.load_errors,
+            "inflight": len(self._inflight),
+            "oldest_age_seconds": round(max(ages), 3) if ages else None,
+            "newest_age_seconds": round(min(ages), 3) if ages else None,
+        })
+        return stats
+
+
+    def save_json(self, path: str) -> int:
+        """
+        만료되지 않은 항목을 JSON 파일로 저장합니다. (문자열 키와 JSON으로 직렬화 가능한 값만 지원)
+        재시작 후 load_json으로 남은 TTL을 유지한 채 복원할 수 있도록 경과 시간을 함께 기록합니다.
+        """
+        now = time.monotonic()
+        entries = [
+            [key, value, now - stored_at]
+            for key, (value, stored_at, ttl) in self._data.items()
+            if now - stored_at < ttl
+        ]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "entries": entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)  # 저장 중 종료돼도 기존 파일이 깨지지 않도록 교체
+        return len(entries)
+
+    def load_json(self, path: str) -> int:
+        """
+        save_json으로 저장한 항목을 불러옵니다. 파일이 없거나 손상됐으면 빈 캐시로 시작합니다.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.info("Cache %s not restored from %s: %s", self.name, path, e)
+            return 0
+
+        # 저장 이후 흐른 시간만큼 더 오래된 것으로 간주
+        offline = max(0.0, time.time() - payload.get("saved_at", time.time()))
+        now = time.monotonic()
+        loaded = 0
+        for key, value, age in payload.get("entries", []):
+            stored_at = now - age - offline
+            ttl = self.negative_ttl if value is None else self.ttl
+            if now - stored_at < ttl:
+                self.set(key, value, stored_at=stored_at)
+                loaded += 1
+        return loaded
+
+
+def cache_stats() -> dict:
+    """
+    등록된 모든 캐시의 통계
+    """
+    return {name: cache.stats() for name, cache in _registry.items()}
@@ -0,0 +1,9 @@
+# tests/conftest.py
+
+import os
+
+# 설정 모듈은 import 시점에 필수 환경 변수를 확인하므로, 실제 값이 없으면 테스트용 값으로 채움
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test-client-id")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test-client-secret")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("ALGORITHM", "HS256")
@@ -0,0 +1,31 @@
+# tests/test_cache.py
+# TTLCache의 epoch 가드: 로드 중 무효화된 그룹의 결과만 버리고 다른 그룹의 로드는 저장되는지 확인
+
+from src.utils.cache import TTLCache
+
+
+def test_set_skips_value_loaded_before_its_group_was_invalidated():
+    cache = TTLCache("test_epoch_same_group", maxsize=10)
+    epoch = cache.epoch
+    cache.invalidate_group(1)
+    cache.set("page", "stale", group=1, epoch=epoch)
+    assert "page" not in cache
+
+
+def test_set_keeps_value_when_another_group_was_invalidated():
+    cache = TTLCache("test_epoch_other_group", maxsize=10)
+    epoch = cache.epoch
+    cache.invalidate_group(2)
+    cache.invalidate("unrelated")
+    cache.set("page", "fresh", group=1, epoch=epoch)
+    assert cache.get("page") == "fresh"
+
+
+def test_clear_discards_all_loads_started_before_it():
+    cache = TTLCache("test_epoch_clear", maxsize=10)
+    epoch = cache.epoch
+    cache.clear()
+    cache.set("page", "stale", group=1, epoch=epoch)
+    assert "page" not in cache
+    cache.set("page", "fresh", group=1, epoch=cache.epoch)
+    assert cache.get("page") == "fresh"
@@ -0,0 +1,95 @@
+# tests/test_share_song_concurrency.py
+# 하루 한 번 공유 제한이 (sharedBy, sharedDay) 유니크 제약으로 지켜지는지 동시 요청으로 확인
+# 마이그레이션이 적용된 PostgreSQL이 필요합니다. (DATABASE_URL이 없거나 연결할 수 없으면 건너뜀)
+# 테스트용 사용자·트랙을 만들고 끝나면 지웁니다.
+
+import asyncio
+import os
+import uuid
+import pytest
+from dotenv import load_dotenv
+from fastapi import HTTPException
+
+load_dotenv()
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("DATABASE_URL is not set (requires a migrated PostgreSQL database)", allow_module_level=True)
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.future import select
+from src.crud import share_song
+from src.database import SessionLocal, engine
+from src.models import User, Song, Track, FeedItem, DailyTrackShare
+
+CONCURRENT_SHARES = 10
+
+
+async def _create_user() -> int:
+    async with SessionLocal() as db:
+        result = await db.execute(
+            insert(User)
+            .values(email=f"share-race-{uuid.uuid4().hex}@test.invalid", hashed_pw="x", name="share race")
+            .returning(User.userId)
+        )
+        user_id = result.scalar_one()
+        await db.commit()
+        return user_id
+
+
+async def _cleanup(user_id: int, uri: str) -> None:
+    async with SessionLocal() as db:
+        user_songs = select(Song.songId).where(Song.sharedBy == user_id)
+        track_ids = select(Track.trackId).where(Track.uri == uri)
+        await db.execute(delete(FeedItem).where(FeedItem.song_id.in_(user_songs)))
+        await db.execute(delete(DailyTrackShare).where(DailyTrackShare.track_id.in_(track_ids)))
+        await db.execute(delete(Song).where(Song.sharedBy == user_id))
+        await db.execute(delete(Track).where(Track.uri == uri))
+        await db.execute(delete(User).where(User.userId == user_id))
+        await db.commit()
+
+
+def test_concurrent_shares_on_the_same_day_insert_exactly_one_row():
+    track_id = uuid.uuid4().hex[:22]
+    uri = f"spotify:track:{track_id}"
+
+    async def share(user_id: int, start: asyncio.Event):
+        async with SessionLocal() as db:
+            await db.connection()  # 모든 요청이 커넥션을 잡은 뒤 동시에 시작하도록 대기
+            await start.wait()
+            try:
+                await share_song(
+                    db,
+                    user_id=user_id,
+                    song_title="Race",
+                    artist="Tester",
+                    album="Concurrency",
+                    spotify_url=f"https://open.spotify.com/track/{track_id}",
+                    album_cover_url=None,
+                    uri=uri,
+                )
+                return "shared"
+            except HTTPException as e:
+                return e.status_code
+
+    async def scenario():
+        try:
+            user_id = await _create_user()
+        except OSError as e:
+            pytest.skip(f"PostgreSQL is not reachable: {e}")
+        try:
+            start = asyncio.Event()
+            shares = [asyncio.ensure_future(share(user_id, start)) for _ in range(CONCURRENT_SHARES)]
+            await asyncio.sleep(0.2)
+            start.set()
+            outcomes = await asyncio.gather(*shares)
+
+            async with SessionLocal() as db:
+                rows = await db.execute(select(func.count()).select_from(Song).where(Song.sharedBy == user_id))
+                return outcomes, rows.scalar_one()
+        finally:
+            await _cleanup(user_id, uri)
+            await engine.dispose()
+
+    outcomes, song_rows = asyncio.run(scenario())
+    assert outcomes.count("shared") == 1
+    assert outcomes.count(400) == CONCURRENT_SHARES - 1
+    assert song_rows == 1
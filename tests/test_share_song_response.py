@@ -0,0 +1,63 @@
+# tests/test_share_song_response.py
+# 곡 정보가 tracks 테이블로 옮겨진 뒤에도 공유 응답의 shared_song이 평평한 필드를 유지하는지 확인
+# DB 없이 get_db/get_current_user와 share_song을 바꿔 끼워 엔드포인트만 호출합니다.
+
+import asyncio
+import os
+from datetime import datetime
+import httpx
+import pytest
+from src.models import User, Song, Track
+
+SHARED_SONG_KEYS = {
+    "songId", "title", "artist", "album", "spotify_url", "album_cover_url", "uri", "sharedBy", "sharedAt", "reaction",
+}
+
+
+@pytest.fixture
+def app(monkeypatch):
+    # src.main은 import 시 DATABASE_URL을 요구하지만 이 테스트는 DB에 연결하지 않음
+    if not os.getenv("DATABASE_URL"):
+        monkeypatch.setenv("DATABASE_URL", "postgresql://test@localhost/test")
+    from src.main import app
+    from src.database import get_db
+    from src.auth.dependencies import get_current_user
+    from src.routers import songs as songs_router
+
+    user = User(userId=7, email="share@test.invalid", hashed_pw="x", name="share")
+    track = Track(
+        trackId=3, uri="spotify:track:4uLU6hMCjMI75M1A2tKUQC", title="Title", artist="Artist", album="Album",
+        spotify_url="https://open.spotify.com/track/4uLU6hMCjMI75M1A2tKUQC", album_cover_url=None,
+    )
+
+    async def fake_share_song(db, user_id, **kwargs):
+        return Song(songId=11, track_id=track.trackId, track=track, sharedBy=user_id, sharedAt=datetime(2026, 1, 1), reaction=0)
+
+    async def fake_invalidate(db, user_id):
+        return None
+
+    async def override_get_db():
+        yield None
+
+    monkeypatch.setattr(songs_router, "share_song", fake_share_song)
+    monkeypatch.setattr(songs_router, "invalidate_feeds_of_author", fake_invalidate)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield app
+    app.dependency_overrides.clear()
+
+
+def test_share_response_keeps_flat_song_fields(app):
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post("/songs/spotify:track:4uLU6hMCjMI75M1A2tKUQC/share", json={
+                "title": "Title", "artist": "Artist", "album": "Album",
+                "spotify_url": "https://open.spotify.com/track/4uLU6hMCjMI75M1A2tKUQC",
+            })
+
+    response = asyncio.run(main())
+    assert response.status_code == 200
+    shared_song = response.json()["shared_song"]
+    assert set(shared_song) == SHARED_SONG_KEYS
+    assert shared_song["title"] == "Title"
+    assert shared_song["uri"] == "spotify:track:4uLU6hMCjMI75M1A2tKUQC"
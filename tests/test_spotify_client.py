@@ -0,0 +1,120 @@
+# tests/test_spotify_client.py
+# 비동기 Spotify 클라이언트를 로컬 가짜 Spotify 서버(src/services/fake_spotify.py)에 붙여 검증
+# 네트워크 없이 ASGI 앱을 httpx 트랜스포트로 직접 호출합니다.
+
+import asyncio
+import time
+import httpx
+import pytest
+from src.services import fake_spotify
+from src.services.spotify_client import SpotifyClient, SpotifyError, SpotifyUnavailableError
+
+FAKE_BASE_URL = "http://fake-spotify"
+TRACK_ID = "4uLU6hMCjMI75M1A2tKUQC"
+
+
+@pytest.fixture(autouse=True)
+def fake_upstream(monkeypatch):
+    # 지연·오류·레이트 리밋 없이 시작하고, 테스트마다 발급 토큰을 비움
+    monkeypatch.setattr(fake_spotify, "LATENCY_MS", 0)
+    monkeypatch.setattr(fake_spotify, "ERROR_RATE", 0)
+    monkeypatch.setattr(fake_spotify, "RATE_LIMIT", 0)
+    monkeypatch.setattr(fake_spotify, "_window_started", time.monotonic())
+    monkeypatch.setattr(fake_spotify, "_window_count", 0)
+    fake_spotify.issued_tokens.clear()
+
+
+def make_client(**kwargs) -> SpotifyClient:
+    client = SpotifyClient("client-id", "client-secret", api_base_url=FAKE_BASE_URL, accounts_base_url=FAKE_BASE_URL, **kwargs)
+    client._http = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_spotify.app))
+    return client
+
+
+def run(scenario):
+    async def main():
+        client = make_client()
+        try:
+            return await scenario(client)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_search_returns_tracks():
+    async def scenario(client):
+        return await client.search("hello", limit=5)
+
+    items = run(scenario)["tracks"]["items"]
+    assert len(items) == 5
+    assert all(item["uri"].startswith("spotify:track:") for item in items)
+
+
+def test_track_and_missing_track():
+    async def scenario(client):
+        track = await client.track(TRACK_ID)
+        with pytest.raises(SpotifyError) as missing:
+            await client.track("0" + TRACK_ID[1:])  # 가짜 서버는 "0"으로 시작하는 ID를 없는 트랙으로 취급
+        return track, missing.value
+
+    track, missing = run(scenario)
+    assert track["id"] == TRACK_ID
+    assert missing.status_code == 404
+
+
+def test_tracks_batch_keeps_request_order():
+    async def scenario(client):
+        return await client.tracks([TRACK_ID, "0" + TRACK_ID[1:]])
+
+    tracks = run(scenario)["tracks"]
+    assert tracks[0]["id"] == TRACK_ID
+    assert tracks[1] is None
+
+
+def test_token_is_reused_until_expiry():
+    async def scenario(client):
+        await client.search("a")
+        await client.track(TRACK_ID)
+        reused = client.token_refreshes
+        client._token_expires_at = 0  # 만료 시각이 지난 것으로 만듦
+        await client.search("b")
+        return reused, client.token_refreshes
+
+    reused, refreshed = run(scenario)
+    assert reused == 1
+    assert refreshed == 2
+
+
+def test_concurrent_calls_share_one_token_refresh():
+    async def scenario(client):
+        await asyncio.gather(*[client.search(f"q{idx}") for idx in range(10)])
+        return client.token_refreshes
+
+    assert run(scenario) == 1
+
+
+def test_expired_token_is_refreshed_and_retried_on_401():
+    async def scenario(client):
+        await client.search("warm up")
+        fake_spotify.issued_tokens.clear()  # 서버 쪽에서 먼저 토큰이 만료된 상황
+        track = await client.track(TRACK_ID)
+        return track, client.token_refreshes
+
+    track, refreshes = run(scenario)
+    assert track["id"] == TRACK_ID
+    assert refreshes == 2
+
+
+def test_rate_limit_longer_than_max_wait_fails_fast(monkeypatch):
+    monkeypatch.setattr(fake_spotify, "RATE_LIMIT", 1)
+    monkeypatch.setattr(fake_spotify, "RETRY_AFTER", 30)
+
+    async def scenario(client):
+        await client.search("first")
+        with pytest.raises(SpotifyUnavailableError) as limited:
+            await client.search("second")
+        return limited.value, client.rate_limited
+
+    limited, rate_limited = run(scenario)
+    assert limited.retry_after == 30
+    assert rate_limited == 1